@@ -33,6 +33,17 @@ export interface ChatResponseMessage {
   steps: string[];
 }
 
+/** A tool step taken mid-turn, sent before the final `chat` message. */
+export interface StepMessage {
+  type: "step";
+  step: string;
+}
+
+/** Streamed speech has started, ahead of the "chat" message. */
+export interface SpeakingMessage {
+  type: "speaking";
+}
+
 export interface TtsDoneMessage {
   type: "tts_done";
 }
@@ -62,6 +73,8 @@ export type ServerMessage =
   | TurnMessage
   | ThinkingMessage
   | ChatResponseMessage
+  | StepMessage
+  | SpeakingMessage
   | TtsDoneMessage
   | CancelledMessage
   | ResetMessage
@@ -0,0 +1,17 @@
+let loaded: Promise<void> | null = null;
+
+/**
+ * Loads `.env` into the process environment, at most once per process.
+ * A missing `.env` file is not an error.
+ */
+export function loadDotenvOnce(): Promise<void> {
+  loaded ??= (async () => {
+    try {
+      const { load } = await import("@std/dotenv");
+      await load({ export: true });
+    } catch {
+      // .env not found — that's fine
+    }
+  })();
+  return loaded;
+}
@@ -0,0 +1,8 @@
+import { assertStrictEquals } from "@std/assert";
+import { loadDotenvOnce } from "./dotenv.ts";
+
+Deno.test("loadDotenvOnce loads at most once per process", async () => {
+  const first = loadDotenvOnce();
+  assertStrictEquals(loadDotenvOnce(), first);
+  await first;
+});
@@ -0,0 +1,38 @@
+/**
+ * Map-backed least-recently-used cache. Reads refresh an entry; once more
+ * than `maxEntries` are stored, the least recently used one is evicted.
+ */
+export class LruCache<K, V> {
+  readonly #entries = new Map<K, V>();
+  readonly #maxEntries: number;
+
+  constructor(maxEntries: number) {
+    this.#maxEntries = maxEntries;
+  }
+
+  get size(): number {
+    return this.#entries.size;
+  }
+
+  get(key: K): V | undefined {
+    const hit = this.#entries.get(key);
+    if (hit !== undefined) {
+      // Re-insert to mark as most recently used.
+      this.#entries.delete(key);
+      this.#entries.set(key, hit);
+    }
+    return hit;
+  }
+
+  set(key: K, value: V): void {
+    this.#entries.delete(key);
+    this.#entries.set(key, value);
+    if (this.#entries.size > this.#maxEntries) {
+      this.#entries.delete(this.#entries.keys().next().value!);
+    }
+  }
+
+  clear(): void {
+    this.#entries.clear();
+  }
+}
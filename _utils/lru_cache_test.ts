@@ -0,0 +1,24 @@
+import { assertEquals } from "@std/assert";
+import { LruCache } from "./lru_cache.ts";
+
+Deno.test("LruCache evicts the least recently used entry", () => {
+  const cache = new LruCache<string, number>(2);
+  cache.set("a", 1);
+  cache.set("b", 2);
+  assertEquals(cache.get("a"), 1);
+  cache.set("c", 3);
+  assertEquals(cache.get("a"), 1);
+  assertEquals(cache.get("b"), undefined);
+  assertEquals(cache.get("c"), 3);
+  assertEquals(cache.size, 2);
+});
+
+Deno.test("LruCache set refreshes an existing key", () => {
+  const cache = new LruCache<string, number>(2);
+  cache.set("a", 1);
+  cache.set("b", 2);
+  cache.set("a", 10);
+  cache.set("c", 3);
+  assertEquals(cache.get("a"), 10);
+  assertEquals(cache.get("b"), undefined);
+});
@@ -1,4 +1,4 @@
-import { build, type Plugin } from "esbuild";
+import { build, type BuildOptions, type Plugin } from "esbuild";
 import { denoPlugins } from "@luca/esbuild-deno-loader";
 import { resolve, toFileUrl } from "@std/path";
 import type { AgentEntry } from "./_discover.ts";
@@ -27,7 +27,6 @@ const WORKER_STUBS: Record<string, string> = {
   "builtin_tools": [
     "export function getBuiltinToolSchemas() { return []; }",
     "export function executeBuiltinTool() { return null; }",
-    "export function htmlToText() { return ''; }",
   ].join("\n"),
   "config":
     "export function loadPlatformConfig() { throw new Error('unavailable in worker'); }",
@@ -63,6 +62,32 @@ async function precomputeSchemas(agent: AgentEntry) {
   return agentToolsToSchemas(mod.default.tools);
 }
 
+/** esbuild options for an agent's browser client, shared by build and dev. */
+export function clientBuildOptions(
+  entry: string,
+  outfile: string,
+): BuildOptions {
+  return {
+    plugins: [workletTextPlugin, ...denoPlugins({ configPath }) as Plugin[]],
+    entryPoints: [entry],
+    bundle: true,
+    format: "esm",
+    platform: "neutral",
+    mainFields: ["module", "main"],
+    outfile,
+    target: "es2022",
+    treeShaking: true,
+    minify: true,
+    legalComments: "none",
+    define: { "process.env.NODE_ENV": '"production"' },
+    drop: ["debugger"],
+    loader: { ".worklet.js": "text" },
+    jsx: "automatic",
+    jsxImportSource: "preact",
+    logOverride: { "commonjs-variable-in-esm": "silent" },
+  };
+}
+
 function jsBytes(metafile: { outputs: Record<string, { bytes: number }> }) {
   for (const [file, info] of Object.entries(metafile.outputs)) {
     if (file.endsWith(".js")) return info.bytes;
@@ -120,24 +145,8 @@ export async function bundleAgent(
   await Deno.remove(tempEntry).catch(() => {});
 
   const clientResult = await build({
-    plugins: [workletTextPlugin, ...denoPlugins({ configPath }) as Plugin[]],
-    entryPoints: [agent.clientEntry],
-    bundle: true,
-    format: "esm",
-    platform: "neutral",
-    mainFields: ["module", "main"],
-    outfile: `${outDir}/client.js`,
-    target: "es2022",
-    treeShaking: true,
-    minify: true,
-    legalComments: "none",
-    define: { "process.env.NODE_ENV": '"production"' },
-    drop: ["debugger"],
+    ...clientBuildOptions(agent.clientEntry, `${outDir}/client.js`),
     metafile: true,
-    loader: { ".worklet.js": "text" },
-    jsx: "automatic",
-    jsxImportSource: "preact",
-    logOverride: { "commonjs-variable-in-esm": "silent" },
   });
 
   await Deno.writeTextFile(
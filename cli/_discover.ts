@@ -1,6 +1,5 @@
 import { parse as parseDotenv } from "@std/dotenv/parse";
 import { relative } from "@std/path";
-import { walk } from "@std/fs/walk";
 
 export interface AgentEntry {
   slug: string;
@@ -10,29 +9,38 @@ export interface AgentEntry {
   clientEntry: string;
 }
 
-async function loadAgent(dir: string): Promise<AgentEntry | null> {
+/** Names of the entries in `dir`, or null if it cannot be read. */
+async function listDir(dir: string): Promise<Set<string> | null> {
   try {
-    await Deno.stat(`${dir}/agent.ts`);
+    const names = new Set<string>();
+    for await (const entry of Deno.readDir(dir)) names.add(entry.name);
+    return names;
   } catch {
     return null;
   }
+}
+
+async function loadAgent(
+  dir: string,
+  names: Set<string>,
+): Promise<AgentEntry | null> {
+  if (!names.has("agent.ts")) return null;
 
+  // The listing already says which optional files exist, so neither needs
+  // its own stat (or a failed open) to find out.
+  if (!names.has(".env")) return null;
   const envText = await Deno.readTextFile(`${dir}/.env`).catch(() => "");
   const env = parseDotenv(envText);
   if (!env.SLUG) return null;
 
-  let clientEntry = "ui/client.tsx";
-  try {
-    await Deno.stat(`${dir}/client.tsx`);
-    clientEntry = `${dir}/client.tsx`;
-  } catch { /* use default */ }
-
   return {
     slug: env.SLUG,
     dir,
     entryPoint: `${dir}/agent.ts`,
     env,
-    clientEntry,
+    clientEntry: names.has("client.tsx")
+      ? `${dir}/client.tsx`
+      : "ui/client.tsx",
   };
 }
 
@@ -47,7 +55,8 @@ export async function discoverAgents(): Promise<AgentEntry[]> {
     // rel looks like "night-owl" or "night-owl/src" — not ".." or absolute
     if (rel && !rel.startsWith("..") && !rel.startsWith("/")) {
       const dir = `examples/${rel.split("/")[0]}`;
-      const agent = await loadAgent(dir);
+      const names = await listDir(dir);
+      const agent = names && await loadAgent(dir, names);
       if (agent) return [agent];
       console.warn(
         `  In ${dir} but no agent.ts + .env with SLUG found, scanning all.`,
@@ -55,19 +64,20 @@ export async function discoverAgents(): Promise<AgentEntry[]> {
     }
   }
 
-  const examples: AgentEntry[] = [];
-  for await (
-    const entry of walk("examples", {
-      maxDepth: 2,
-      includeDirs: false,
-      match: [/agent\.ts$/],
-    })
-  ) {
-    const dir = entry.path.replace(/\/agent\.ts$/, "");
-    const agent = await loadAgent(dir);
-    if (agent) examples.push(agent);
-    else console.warn(`  Skipping ${dir} — no agent.ts or SLUG`);
+  // One listing per example directory answers whether it holds an agent;
+  // the directories are independent, so they are loaded concurrently.
+  const dirs: string[] = [];
+  for await (const entry of Deno.readDir("examples")) {
+    if (entry.isDirectory) dirs.push(`examples/${entry.name}`);
   }
+  const found = await Promise.all(dirs.map(async (dir) => {
+    const names = await listDir(dir);
+    if (!names?.has("agent.ts")) return null;
+    const agent = await loadAgent(dir, names);
+    if (!agent) console.warn(`  Skipping ${dir} — no agent.ts or SLUG`);
+    return agent;
+  }));
+  const examples = found.filter((a): a is AgentEntry => a !== null);
   examples.sort((a, b) => a.slug.localeCompare(b.slug));
   return examples;
 }
@@ -19,15 +19,19 @@ export async function runBuild(
 
   log.header(`Bundling ${agents.length} agent(s)...\n`);
 
-  for (const agent of agents) {
+  // Agents bundle into separate directories, so they are built concurrently
+  // and reported in discovery order once all are done.
+  const results = await Promise.all(agents.map(async (agent) => {
     const t0 = performance.now();
+    const result = await bundle(agent, `${opts.outDir}/${agent.slug}`);
+    return { ...result, ms: performance.now() - t0 };
+  }));
+  agents.forEach((agent, i) => {
     log.agent(agent.slug);
-    const outDir = `${opts.outDir}/${agent.slug}`;
-    const result = await bundle(agent, outDir);
-    log.size("worker.js", result.workerBytes);
-    log.size("client.js", result.clientBytes);
-    log.timing("done", performance.now() - t0);
-  }
+    log.size("worker.js", results[i].workerBytes);
+    log.size("client.js", results[i].clientBytes);
+    log.timing("done", results[i].ms);
+  });
 
   log.success(`Bundles ready in ${opts.outDir}/`);
 }
@@ -39,4 +39,24 @@ describe("runBuild", () => {
     );
     expect(dirs).toEqual(["/custom/path/test-agent"]);
   });
+
+  it("bundles agents concurrently", async () => {
+    const started: string[] = [];
+    let release!: () => void;
+    const gate = new Promise<void>((r) => release = r);
+
+    const done = runBuild(
+      { outDir: "dist/bundle" },
+      () => Promise.resolve([fakeAgent, { ...fakeAgent, slug: "other" }]),
+      async (agent) => {
+        started.push(agent.slug);
+        await gate;
+        return { workerBytes: 1, clientBytes: 1 };
+      },
+    );
+    await new Promise((r) => setTimeout(r, 0));
+    expect(started).toEqual(["test-agent", "other"]);
+    release();
+    await done;
+  });
 });
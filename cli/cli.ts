@@ -1,8 +1,7 @@
 import { parseArgs } from "@std/cli/parse-args";
 import { red } from "@std/fmt/colors";
 
-function printUsage(): void {
-  console.log(`aai — Agent development toolkit
+const USAGE = `aai — Agent development toolkit
 
 Usage: aai <command> [options]
 
@@ -15,7 +14,27 @@ Options:
   -h, --help       Show this help message
   -V, --version    Show version number
 
-Run 'aai <command> --help' for command-specific options.`);
+Run 'aai <command> --help' for command-specific options.`;
+
+const COMMAND_HELP: Record<string, string> = {
+  dev: `aai dev — Start development server
+
+Options:
+  -p, --port <number>  Server port (default: 3000)`,
+  build: `aai build — Bundle agents for production
+
+Options:
+  -o, --out-dir <dir>  Output directory (default: dist/bundle)`,
+  deploy: `aai deploy — Deploy bundled agents
+
+Options:
+  -u, --url <url>          Orchestrator URL (default: http://localhost:3000)
+      --bundle-dir <dir>   Bundle directory (default: dist/bundle)
+      --dry-run            Show what would be deployed without sending`,
+};
+
+function printUsage(): void {
+  console.log(USAGE);
 }
 
 export async function main(args: string[]): Promise<number> {
@@ -32,32 +51,13 @@ export async function main(args: string[]): Promise<number> {
   }
 
   if (rest.includes("--help") || rest.includes("-h")) {
-    switch (command) {
-      case "dev":
-        console.log(`aai dev — Start development server
-
-Options:
-  -p, --port <number>  Server port (default: 3000)`);
-        return 0;
-      case "build":
-        console.log(`aai build — Bundle agents for production
-
-Options:
-  -o, --out-dir <dir>  Output directory (default: dist/bundle)`);
-        return 0;
-      case "deploy":
-        console.log(`aai deploy — Deploy bundled agents
-
-Options:
-  -u, --url <url>          Orchestrator URL (default: http://localhost:3000)
-      --bundle-dir <dir>   Bundle directory (default: dist/bundle)
-      --dry-run            Show what would be deployed without sending`);
-        return 0;
-      default:
-        console.error(red(`error: unknown command '${command}'`));
-        printUsage();
-        return 1;
+    if (!Object.hasOwn(COMMAND_HELP, command)) {
+      console.error(red(`error: unknown command '${command}'`));
+      printUsage();
+      return 1;
     }
+    console.log(COMMAND_HELP[command]);
+    return 0;
   }
 
   switch (command) {
@@ -56,4 +56,8 @@ describe("cli main", () => {
   it("returns 1 for unknown command", async () => {
     expect(await main(["unknown-command"])).toBe(1);
   });
+
+  it("returns 1 for unknown command with --help", async () => {
+    expect(await main(["toString", "--help"])).toBe(1);
+  });
 });
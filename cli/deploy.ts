@@ -1,4 +1,3 @@
-import { walk } from "@std/fs/walk";
 import { log } from "./_output.ts";
 import { type AgentEntry, discoverAgents } from "./_discover.ts";
 
@@ -12,7 +11,6 @@ export interface DeployDeps {
   discover: typeof discoverAgents;
   fetch: typeof globalThis.fetch;
   readTextFile: typeof Deno.readTextFile;
-  walk: typeof walk;
   writeSync: typeof Deno.stdout.writeSync;
 }
 
@@ -20,10 +18,11 @@ const defaultDeps: DeployDeps = {
   discover: discoverAgents,
   fetch: globalThis.fetch.bind(globalThis),
   readTextFile: Deno.readTextFile.bind(Deno),
-  walk,
   writeSync: Deno.stdout.writeSync.bind(Deno.stdout),
 };
 
+const encoder = new TextEncoder();
+
 interface BundleEntry {
   slug: string;
   env: Record<string, string>;
@@ -36,44 +35,33 @@ export async function runDeploy(
   deps: DeployDeps = defaultDeps,
 ): Promise<void> {
   const agents = await deps.discover();
-  const slugs = new Set(agents.map((a: AgentEntry) => a.slug));
-
-  const bundles: BundleEntry[] = [];
-
-  try {
-    for await (
-      const entry of deps.walk(opts.bundleDir, {
-        maxDepth: 2,
-        includeDirs: false,
-        match: [/manifest\.json$/],
-      })
-    ) {
-      const dir = entry.path.replace(/\/manifest\.json$/, "");
-      const slug = dir.split("/").pop()!;
-      if (!slugs.has(slug)) continue;
 
+  // Bundle paths follow from the slugs, so each bundle is read directly
+  // (all of them concurrently) instead of walking the bundle directory.
+  const found = await Promise.all(
+    agents.map(async ({ slug }: AgentEntry): Promise<BundleEntry | null> => {
+      const dir = `${opts.bundleDir}/${slug}`;
+      let manifestText: string;
+      try {
+        manifestText = await deps.readTextFile(`${dir}/manifest.json`);
+      } catch {
+        return null; // not built
+      }
       try {
         const manifest: { slug: string; env: Record<string, string> } = JSON
-          .parse(await deps.readTextFile(entry.path));
-        const worker = await deps.readTextFile(`${dir}/worker.js`);
-        const client = await deps.readTextFile(`${dir}/client.js`);
-        bundles.push({
-          slug: manifest.slug,
-          env: manifest.env,
-          worker,
-          client,
-        });
+          .parse(manifestText);
+        const [worker, client] = await Promise.all([
+          deps.readTextFile(`${dir}/worker.js`),
+          deps.readTextFile(`${dir}/client.js`),
+        ]);
+        return { slug: manifest.slug, env: manifest.env, worker, client };
       } catch {
         log.warn(`  Skipping ${slug} — incomplete bundle`);
+        return null;
       }
-    }
-  } catch {
-    log.error(
-      `No bundles found in ${opts.bundleDir}/. Run \`deno task build\` first.`,
-    );
-    Deno.exit(1);
-  }
-
+    }),
+  );
+  const bundles = found.filter((b): b is BundleEntry => b !== null);
   bundles.sort((a, b) => a.slug.localeCompare(b.slug));
 
   if (bundles.length === 0) {
@@ -97,7 +85,7 @@ export async function runDeploy(
   let failures = 0;
 
   for (const bundle of bundles) {
-    deps.writeSync(new TextEncoder().encode(`  ${bundle.slug}...`));
+    deps.writeSync(encoder.encode(`  ${bundle.slug}...`));
 
     try {
       const resp = await deps.fetch(url, {
@@ -29,15 +29,6 @@ describe("runDeploy", () => {
         }
         return Promise.resolve("// js content");
       },
-      walk: async function* (root: string | URL) {
-        yield {
-          path: `${String(root)}/agent-a/manifest.json`,
-          name: "manifest.json",
-          isFile: true,
-          isDirectory: false,
-          isSymlink: false,
-        };
-      } as DeployDeps["walk"],
       writeSync: () => 0,
       ...overrides,
     };
@@ -63,6 +54,46 @@ describe("runDeploy", () => {
     expect(fetched).toEqual(["http://localhost:3000/deploy"]);
   });
 
+  it("skips agents that have not been built", async () => {
+    const posted: string[] = [];
+    const deps = makeDeps({
+      readTextFile: (path: string | URL) => {
+        const p = String(path);
+        if (p.includes("agent-b")) {
+          return Promise.reject(new Deno.errors.NotFound(p));
+        }
+        if (p.endsWith("manifest.json")) {
+          return Promise.resolve(
+            JSON.stringify({ slug: "agent-a", env: { SLUG: "agent-a" } }),
+          );
+        }
+        return Promise.resolve("// js content");
+      },
+      discover: () =>
+        Promise.resolve(["agent-a", "agent-b"].map((slug) => ({
+          slug,
+          dir: `examples/${slug}`,
+          entryPoint: `examples/${slug}/agent.ts`,
+          env: { SLUG: slug },
+          clientEntry: "ui/client.tsx",
+        }))),
+      fetch: (_input, init) => {
+        posted.push(JSON.parse(String(init?.body)).slug);
+        return Promise.resolve(new Response("ok", { status: 200 }));
+      },
+    });
+
+    await runDeploy(
+      {
+        url: "http://localhost:3000",
+        bundleDir: "dist/bundle",
+        dryRun: false,
+      },
+      deps,
+    );
+    expect(posted).toEqual(["agent-a"]);
+  });
+
   it("dry run does not call fetch", async () => {
     let fetchCalled = false;
     const deps = makeDeps({
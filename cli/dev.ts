@@ -1,11 +1,7 @@
-import { type BuildContext, context, type Plugin } from "esbuild";
-import { denoPlugins } from "@luca/esbuild-deno-loader";
-import { resolve } from "@std/path";
+import { type BuildContext, context } from "esbuild";
 import { log } from "./_output.ts";
 import { discoverAgents } from "./_discover.ts";
-import { bundleAgent, workletTextPlugin } from "./_bundler.ts";
-
-const configPath = resolve("deno.json");
+import { bundleAgent, clientBuildOptions } from "./_bundler.ts";
 
 export interface DevOpts {
   port: number;
@@ -61,37 +57,26 @@ export async function runDev(
     deps.exit(1);
   }
 
+  // Agents bundle into separate directories, so they are built concurrently.
+  const bundleAll = () =>
+    Promise.all(
+      agents.map((agent) => deps.bundle(agent, `${BUNDLE_DIR}/${agent.slug}`)),
+    );
+
   log.header(`Bundling ${agents.length} agent(s)...`);
-  for (const agent of agents) {
+  const bundles = await bundleAll();
+  agents.forEach((agent, i) => {
     log.agent(agent.slug);
-    const slugDir = `${BUNDLE_DIR}/${agent.slug}`;
-    const { workerBytes, clientBytes } = await deps.bundle(agent, slugDir);
-    log.size("worker.js", workerBytes);
-    log.size("client.js", clientBytes);
-  }
+    log.size("worker.js", bundles[i].workerBytes);
+    log.size("client.js", bundles[i].clientBytes);
+  });
 
   const clientContexts: BuildContext[] = [];
   for (const agent of agents) {
     const slugDir = `${BUNDLE_DIR}/${agent.slug}`;
     const ctx = await deps.esbuildContext({
-      plugins: [workletTextPlugin, ...denoPlugins({ configPath }) as Plugin[]],
-      entryPoints: [agent.clientEntry],
-      bundle: true,
-      format: "esm",
-      platform: "neutral",
-      mainFields: ["module", "main"],
-      outfile: `${slugDir}/client.js`,
+      ...clientBuildOptions(agent.clientEntry, `${slugDir}/client.js`),
       sourcemap: true,
-      target: "es2022",
-      treeShaking: true,
-      minify: true,
-      legalComments: "none",
-      define: { "process.env.NODE_ENV": '"production"' },
-      drop: ["debugger"],
-      loader: { ".worklet.js": "text" },
-      jsx: "automatic",
-      jsxImportSource: "preact",
-      logOverride: { "commonjs-variable-in-esm": "silent" },
     });
     await ctx.watch();
     clientContexts.push(ctx);
@@ -120,10 +105,7 @@ export async function runDev(
       debounceTimer = setTimeout(async () => {
         log.info("\n  File change detected, rebuilding...");
         try {
-          for (const agent of agents) {
-            const slugDir = `${BUNDLE_DIR}/${agent.slug}`;
-            await deps.bundle(agent, slugDir);
-          }
+          await bundleAll();
           log.info("  Restarting orchestrator...");
           orchestrator.kill();
           await orchestrator.status.catch(() => {});
@@ -135,10 +117,12 @@ export async function runDev(
     }
   })();
 
-  console.log(`\n  Agents:`);
-  for (const a of agents) {
-    console.log(`    http://localhost:${opts.port}/${a.slug}/`);
-  }
+  console.log(
+    [
+      `\n  Agents:`,
+      ...agents.map((a) => `    http://localhost:${opts.port}/${a.slug}/`),
+    ].join("\n"),
+  );
   log.info("  Watching for changes...\n");
 
   const cleanup = () => {
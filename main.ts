@@ -1,9 +1,7 @@
 import { createOrchestrator } from "./server/orchestrator.ts";
+import { loadDotenvOnce } from "./_utils/dotenv.ts";
 
-try {
-  const { load } = await import("@std/dotenv");
-  await load({ export: true });
-} catch { /* .env not found — fine */ }
+await loadDotenvOnce();
 
 const bundleDir = Deno.env.get("BUNDLE_DIR") ?? "dist/bundle";
 const { app, agents } = await createOrchestrator({ bundleDir });
@@ -3,6 +3,7 @@ import type { SttHandle } from "./stt.ts";
 import type { ExecuteTool } from "./tool_executor.ts";
 import type { PlatformConfig } from "./config.ts";
 import type { CallLLMOptions } from "./llm.ts";
+import type { TtsText } from "./tts.ts";
 import type { ChatMessage, LLMResponse, ToolSchema } from "./types.ts";
 import { DEFAULT_STT_CONFIG, DEFAULT_TTS_CONFIG } from "./types.ts";
 
@@ -51,26 +52,39 @@ export function createMockSttHandle(): SttHandle & {
 
 export interface MockTtsClient {
   synthesizeCalls: { text: string }[];
+  prewarmCalls: number;
   closeCalled: boolean;
   synthesize(
-    text: string,
+    text: TtsText,
     onAudio: (chunk: Uint8Array) => void,
     signal?: AbortSignal,
   ): Promise<void>;
+  prewarm(): void;
   close(): void;
 }
 
 export function createMockTtsClient(): MockTtsClient {
   return {
     synthesizeCalls: [],
+    prewarmCalls: 0,
     closeCalled: false,
     synthesize(
-      text: string,
+      text: TtsText,
       _onAudio: (chunk: Uint8Array) => void,
       _signal?: AbortSignal,
     ): Promise<void> {
-      this.synthesizeCalls.push({ text });
-      return Promise.resolve();
+      if (typeof text === "string") {
+        this.synthesizeCalls.push({ text });
+        return Promise.resolve();
+      }
+      const call = { text: "" };
+      this.synthesizeCalls.push(call);
+      return (async () => {
+        for await (const chunk of text) call.text += chunk;
+      })();
+    },
+    prewarm() {
+      this.prewarmCalls++;
     },
     close() {
       this.closeCalled = true;
@@ -1,13 +1,26 @@
-import { Hono } from "@hono/hono";
-import { serveStatic } from "@hono/hono/deno";
+import { Hono, type MiddlewareHandler } from "@hono/hono";
 import type { PlatformConfig } from "./config.ts";
 import { applyMiddleware } from "./middleware.ts";
 import { renderAgentPage } from "../ui/html.ts";
 import { favicon } from "./routes/favicon.ts";
 import { createHealthRoute } from "./routes/health.ts";
 import { agentToolsToSchemas } from "./protocol.ts";
-import { createToolExecutor, toToolHandlers } from "./tool_executor.ts";
-import { ServerSession } from "./session.ts";
+import {
+  createToolExecutor,
+  type ExecuteTool,
+  toToolHandlers,
+} from "./tool_executor.ts";
+import {
+  buildSystemPrompt,
+  enabledBuiltinTools,
+  ServerSession,
+} from "./session.ts";
+import { callLLM } from "./llm.ts";
+import { executeTurns, type TurnResult } from "./turn_handler.ts";
+import { getLogger } from "../_utils/logger.ts";
+import { loadDotenvOnce } from "../_utils/dotenv.ts";
+import { ResponseCache } from "./response_cache.ts";
+import { AudioCache } from "./audio_cache.ts";
 import { handleSessionWebSocket, type Session } from "./ws_handler.ts";
 import {
   type AgentOptions,
@@ -15,6 +28,16 @@ import {
   DEFAULT_INSTRUCTIONS,
   type ToolDef,
 } from "./agent_types.ts";
+import type { AgentConfig, ToolSchema } from "./types.ts";
+
+/** Everything a session needs that is identical across connections. */
+interface SessionSetup {
+  agentConfig: AgentConfig;
+  toolSchemas: ToolSchema[];
+  executeTool: ExecuteTool;
+  secrets: Record<string, string>;
+  config: PlatformConfig;
+}
 
 /**
  * A voice agent that doubles as an HTTP server handler.
@@ -58,9 +81,13 @@ export class Agent {
   readonly onTurn?: AgentOptions["onTurn"];
 
   readonly #sessions = new Map<string, Session>();
+  readonly #responseCache = new ResponseCache();
+  readonly #audioCache = new AudioCache();
   #platform:
     | { secrets: Record<string, string>; config: PlatformConfig }
     | null = null;
+  #sessionSetup: SessionSetup | null = null;
+  #sessionSetupLoading: Promise<SessionSetup> | null = null;
   #app: Hono;
 
   constructor(options: AgentOptions) {
@@ -80,6 +107,14 @@ export class Agent {
 
   /** Standard `Request → Response` handler. */
   fetch = (req: Request): Response | Promise<Response> => {
+    // Session upgrades skip routing and middleware: CORS and compression do
+    // not apply to a WebSocket handshake.
+    if (
+      req.headers.get("upgrade")?.toLowerCase() === "websocket" &&
+      new URL(req.url).pathname === "/session"
+    ) {
+      return this.upgrade(req);
+    }
     return this.#app.fetch(req);
   };
 
@@ -98,53 +133,114 @@ export class Agent {
   async serve(
     opts?: { port?: number; clientDir?: string },
   ): Promise<Deno.HttpServer> {
-    try {
-      const { load } = await import("@std/dotenv");
-      await load({ export: true });
-    } catch {
-      // .env not found — that's fine
-    }
+    await loadDotenvOnce();
 
     const clientDir = opts?.clientDir ?? Deno.env.get("CLIENT_DIR");
     if (clientDir) {
-      this.#app = this.#buildApp(clientDir);
+      // Only self-served agents with a client directory need static files.
+      const { serveStatic } = await import("@hono/hono/deno");
+      this.#app = this.#buildApp(serveStatic({ root: clientDir }));
     }
 
+    // Load config, tool schemas and the builtin tools module while the
+    // server starts, so the first connection does not pay for it. Failures
+    // are left for that connection to report.
+    this.#loadSessionSetup().catch(() => {});
+
     const port = opts?.port ?? parseInt(Deno.env.get("PORT") ?? "3000");
     const server = Deno.serve({ port }, this.fetch);
     console.log(`${this.name} listening on http://localhost:${port}`);
     return server;
   }
 
-  async #handleWs(socket: WebSocket): Promise<void> {
-    const { getBuiltinToolSchemas } = await import("./builtin_tools.ts");
-    const toolSchemas = [
-      ...agentToolsToSchemas(this.tools),
-      ...getBuiltinToolSchemas([...(this.builtinTools ?? [])]),
-    ];
+  /**
+   * Runs each text as an independent single-turn conversation, concurrently,
+   * with this agent's prompt and tools — for evals and dataset runs. Results
+   * are in input order.
+   */
+  async runTurns(
+    texts: string[],
+    opts?: { concurrency?: number; signal?: AbortSignal },
+  ): Promise<TurnResult[]> {
+    const setup = this.#sessionSetup ?? await this.#loadSessionSetup();
+    const { executeBuiltinTool } = await import("./builtin_tools.ts");
+    const system = buildSystemPrompt(
+      setup.agentConfig,
+      setup.toolSchemas.length > 0,
+    );
+    return executeTurns(
+      texts,
+      [{ role: "system", content: system }],
+      {
+        toolSchemas: setup.toolSchemas,
+        logger: getLogger(`agent:${this.name}`),
+        callLLM,
+        executeBuiltinTool: enabledBuiltinTools(
+          setup.agentConfig,
+          (name, args, signal) =>
+            executeBuiltinTool(name, args, setup.secrets, signal),
+        ),
+        executeUserTool: setup.executeTool,
+        apiKey: setup.config.apiKey,
+        model: setup.config.model,
+        gatewayBase: setup.config.llmGatewayBase,
+      },
+      opts?.signal ?? new AbortController().signal,
+      opts?.concurrency,
+    );
+  }
 
-    const { secrets, config } = await this.#loadPlatform();
+  async #handleWs(socket: WebSocket): Promise<void> {
+    // Only the first connection waits; later ones attach handlers
+    // synchronously from the cached setup.
+    const setup = this.#sessionSetup ?? await this.#loadSessionSetup();
 
     handleSessionWebSocket(socket, this.#sessions, {
-      createSession: (sessionId, ws) => {
-        const agentConfig = {
-          instructions: this.instructions,
-          greeting: this.greeting,
-          voice: this.voice,
-          prompt: this.prompt,
-          builtinTools: this.builtinTools ? [...this.builtinTools] : undefined,
-        };
-        const executeTool = createToolExecutor(
-          toToolHandlers(this.tools),
-          secrets,
-        );
-        return ServerSession.create(sessionId, ws, agentConfig, toolSchemas, {
-          platformConfig: config,
-          executeTool,
-          secrets,
-        });
-      },
+      createSession: (sessionId, ws) =>
+        ServerSession.create(
+          sessionId,
+          ws,
+          setup.agentConfig,
+          setup.toolSchemas,
+          {
+            platformConfig: setup.config,
+            executeTool: setup.executeTool,
+            secrets: setup.secrets,
+            responseCache: this.#responseCache,
+            audioCache: this.#audioCache,
+          },
+        ),
+    });
+  }
+
+  #loadSessionSetup(): Promise<SessionSetup> {
+    this.#sessionSetupLoading ??= this.#buildSessionSetup().catch((err) => {
+      this.#sessionSetupLoading = null;
+      throw err;
     });
+    return this.#sessionSetupLoading;
+  }
+
+  async #buildSessionSetup(): Promise<SessionSetup> {
+    const { getBuiltinToolSchemas } = await import("./builtin_tools.ts");
+    const { secrets, config } = await this.#loadPlatform();
+    this.#sessionSetup = {
+      agentConfig: {
+        instructions: this.instructions,
+        greeting: this.greeting,
+        voice: this.voice,
+        prompt: this.prompt,
+        builtinTools: this.builtinTools ? [...this.builtinTools] : undefined,
+      },
+      toolSchemas: [
+        ...agentToolsToSchemas(this.tools),
+        ...getBuiltinToolSchemas([...(this.builtinTools ?? [])]),
+      ],
+      executeTool: createToolExecutor(toToolHandlers(this.tools), secrets),
+      secrets,
+      config,
+    };
+    return this.#sessionSetup;
   }
 
   async #loadPlatform(): Promise<{
@@ -162,26 +258,19 @@ export class Agent {
     return this.#platform;
   }
 
-  #buildApp(clientDir?: string): Hono {
+  #buildApp(staticFiles?: MiddlewareHandler): Hono {
     const app = new Hono();
     applyMiddleware(app);
     app.route("/", createHealthRoute());
     app.route("/", favicon);
 
-    app.get("/session", (c) => {
-      if (c.req.header("upgrade")?.toLowerCase() !== "websocket") {
-        return c.text("Expected WebSocket upgrade", 400);
-      }
+    app.get("/session", (c) => this.upgrade(c.req.raw));
 
-      const { socket, response } = Deno.upgradeWebSocket(c.req.raw);
-      this.#handleWs(socket);
-      return response;
-    });
-
-    app.get("/", (c) => c.html(renderAgentPage(this.name)));
+    const page = renderAgentPage(this.name);
+    app.get("/", (c) => c.html(page));
 
-    if (clientDir) {
-      app.use("/*", serveStatic({ root: clientDir }));
+    if (staticFiles) {
+      app.use("/*", staticFiles);
     }
 
     return app;
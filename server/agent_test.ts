@@ -4,6 +4,7 @@ import { Agent } from "./agent.ts";
 import { tool } from "./tool.ts";
 import { FAVICON_SVG } from "../ui/html.ts";
 import { DEFAULT_GREETING, DEFAULT_INSTRUCTIONS } from "./agent_types.ts";
+import { createMockLLMResponse } from "./_test_utils.ts";
 
 function makeTestAgent() {
   return new Agent({
@@ -74,6 +75,7 @@ Deno.test("Agent.fetch - GET /health returns ok", async () => {
   const agent = makeTestAgent();
   const res = await agent.fetch(new Request("http://localhost/health"));
   assertEquals(res.status, 200);
+  assertEquals(res.headers.get("content-type"), "application/json");
   const body = await res.json();
   assertEquals(body.status, "ok");
 });
@@ -95,6 +97,44 @@ Deno.test("Agent.fetch - GET /session without upgrade returns 400", async () =>
   assert(text.includes("WebSocket"));
 });
 
+Deno.test("Agent.fetch - /session upgrades skip the middleware", async () => {
+  const agent = makeTestAgent();
+  const upgraded: Request[] = [];
+  agent.upgrade = (req) => {
+    upgraded.push(req);
+    return new Response(null, { status: 101 });
+  };
+  const req = new Request("http://localhost/session", {
+    headers: { upgrade: "WebSocket", origin: "http://example.com" },
+  });
+  const res = await agent.fetch(req);
+  assertEquals(upgraded, [req]);
+  assertEquals(res.headers.get("access-control-allow-origin"), null);
+});
+
+Deno.test("Agent.fetch - other requests still go through the app", async () => {
+  const agent = makeTestAgent();
+  const upgraded: Request[] = [];
+  agent.upgrade = (req) => {
+    upgraded.push(req);
+    return new Response("Expected WebSocket upgrade", { status: 400 });
+  };
+  const headers = { origin: "http://example.com" };
+  const plain = await agent.fetch(
+    new Request("http://localhost/session", { headers }),
+  );
+  const health = await agent.fetch(
+    new Request("http://localhost/health", {
+      headers: { ...headers, upgrade: "websocket" },
+    }),
+  );
+  assertEquals(upgraded.length, 1);
+  assertEquals(plain.status, 400);
+  assertEquals(plain.headers.get("access-control-allow-origin"), "*");
+  assertEquals(health.status, 200);
+  assertEquals(health.headers.get("access-control-allow-origin"), "*");
+});
+
 Deno.test("Agent.fetch - GET /favicon.ico returns SVG", async () => {
   const agent = makeTestAgent();
   const res = await agent.fetch(new Request("http://localhost/favicon.ico"));
@@ -173,3 +213,38 @@ Deno.test("Agent - fetch is a bound function", () => {
   // Can be destructured and still works (bound to the agent)
   assertEquals(typeof fetch, "function");
 });
+
+Deno.test("Agent.runTurns - refuses builtin tools the agent did not enable", async () => {
+  const env = {
+    ASSEMBLYAI_API_KEY: "test-key",
+    ASSEMBLYAI_TTS_API_KEY: "test-tts-key",
+  };
+  const saved = Object.keys(env).map((k) => [k, Deno.env.get(k)] as const);
+  for (const [k, v] of Object.entries(env)) Deno.env.set(k, v);
+  const originalFetch = globalThis.fetch;
+  const requests: { messages: { role: string; content: string | null }[] }[] =
+    [];
+  const replies = [
+    createMockLLMResponse(null, [
+      { id: "c1", name: "run_code", arguments: '{"code":"console.log(1)"}' },
+    ]),
+    createMockLLMResponse("Done."),
+  ];
+  globalThis.fetch = ((_url: string, init?: RequestInit) => {
+    requests.push(JSON.parse(init!.body as string));
+    return Promise.resolve(Response.json(replies[requests.length - 1]));
+  }) as typeof globalThis.fetch;
+
+  try {
+    const [result] = await makeTestAgent().runTurns(["Run some code"]);
+    assertEquals(result.text, "Done.");
+    const toolMessage = requests[1].messages.find((m) => m.role === "tool");
+    assertEquals(toolMessage?.content, 'Error: Unknown tool "run_code"');
+  } finally {
+    globalThis.fetch = originalFetch;
+    for (const [k, v] of saved) {
+      if (v === undefined) Deno.env.delete(k);
+      else Deno.env.set(k, v);
+    }
+  }
+});
@@ -0,0 +1,93 @@
+import { LruCache } from "../_utils/lru_cache.ts";
+
+export const DEFAULT_AUDIO_CACHE_SIZE = 32;
+
+/** Largest frame `coalesceFrames` builds when merging small chunks. */
+export const MAX_FRAME_BYTES = 32 * 1024;
+
+/**
+ * Merges consecutive small PCM chunks into frames of up to `maxBytes`, so
+ * replaying recorded audio takes a few WebSocket sends rather than one per
+ * chunk the TTS service happened to emit. A chunk already larger than
+ * `maxBytes` is kept as is.
+ */
+export function coalesceFrames(
+  chunks: Uint8Array[],
+  maxBytes = MAX_FRAME_BYTES,
+): Uint8Array[] {
+  const frames: Uint8Array[] = [];
+  let run: Uint8Array[] = [];
+  let runBytes = 0;
+  const flush = () => {
+    if (run.length === 1) {
+      frames.push(run[0]);
+    } else if (run.length > 1) {
+      const frame = new Uint8Array(runBytes);
+      let offset = 0;
+      for (const chunk of run) {
+        frame.set(chunk, offset);
+        offset += chunk.length;
+      }
+      frames.push(frame);
+    }
+    run = [];
+    runBytes = 0;
+  };
+  for (const chunk of chunks) {
+    if (runBytes + chunk.length > maxBytes) flush();
+    run.push(chunk);
+    runBytes += chunk.length;
+  }
+  flush();
+  return frames;
+}
+
+/**
+ * LRU cache of synthesized PCM audio keyed by voice and exact text, shared
+ * by every session of an agent. Used for fixed utterances such as the
+ * greeting, which would otherwise be re-synthesized on every connection.
+ */
+export class AudioCache {
+  readonly #entries: LruCache<string, Uint8Array[]>;
+  readonly #pending = new Map<string, Promise<void>>();
+
+  constructor(maxEntries = DEFAULT_AUDIO_CACHE_SIZE) {
+    this.#entries = new LruCache(maxEntries);
+  }
+
+  get size(): number {
+    return this.#entries.size;
+  }
+
+  get(voice: string, text: string): Uint8Array[] | undefined {
+    return this.#entries.get(`${voice}\0${text}`);
+  }
+
+  set(voice: string, text: string, chunks: Uint8Array[]): void {
+    if (chunks.length === 0) return;
+    this.#entries.set(`${voice}\0${text}`, chunks);
+  }
+
+  /** Settles when an in-progress synthesis of `text` (if any) settles. */
+  pending(voice: string, text: string): Promise<void> | undefined {
+    return this.#pending.get(`${voice}\0${text}`);
+  }
+
+  /**
+   * Marks `synthesis` as the in-progress recording of `text`, so other
+   * sessions wait for it instead of synthesizing the same audio again.
+   */
+  track(voice: string, text: string, synthesis: Promise<void>): void {
+    const key = `${voice}\0${text}`;
+    const settled: Promise<void> = synthesis.then(() => {}, () => {}).finally(
+      () => {
+        if (this.#pending.get(key) === settled) this.#pending.delete(key);
+      },
+    );
+    this.#pending.set(key, settled);
+  }
+
+  clear(): void {
+    this.#entries.clear();
+  }
+}
@@ -0,0 +1,78 @@
+import { describe, it } from "@std/testing/bdd";
+import { expect } from "@std/expect";
+import { AudioCache, coalesceFrames } from "./audio_cache.ts";
+
+describe("AudioCache", () => {
+  const audio = [new Uint8Array([1, 2]), new Uint8Array([3])];
+
+  it("keys entries by voice and text", () => {
+    const cache = new AudioCache();
+    cache.set("jess", "Hi there.", audio);
+    expect(cache.get("jess", "Hi there.")).toBe(audio);
+    expect(cache.get("tara", "Hi there.")).toBeUndefined();
+    expect(cache.get("jess", "Hi there")).toBeUndefined();
+  });
+
+  it("skips empty audio", () => {
+    const cache = new AudioCache();
+    cache.set("jess", "Hi.", []);
+    expect(cache.size).toBe(0);
+  });
+
+  it("evicts the least recently used entry", () => {
+    const cache = new AudioCache(2);
+    cache.set("v", "a", audio);
+    cache.set("v", "b", audio);
+    cache.get("v", "a");
+    cache.set("v", "c", audio);
+    expect(cache.get("v", "a")).toBeDefined();
+    expect(cache.get("v", "b")).toBeUndefined();
+  });
+
+  it("tracks in-progress syntheses until they settle", async () => {
+    const cache = new AudioCache();
+    let finish!: () => void;
+    const synthesis = new Promise<void>((r) => finish = r);
+    cache.track("jess", "Hi.", synthesis);
+    const pending = cache.pending("jess", "Hi.");
+    expect(pending).toBeDefined();
+    expect(cache.pending("tara", "Hi.")).toBeUndefined();
+
+    finish();
+    await pending;
+    expect(cache.pending("jess", "Hi.")).toBeUndefined();
+  });
+
+  it("settles tracked syntheses that fail", async () => {
+    const cache = new AudioCache();
+    cache.track("jess", "Hi.", Promise.reject(new Error("boom")));
+    await cache.pending("jess", "Hi.");
+    expect(cache.pending("jess", "Hi.")).toBeUndefined();
+  });
+});
+
+describe("coalesceFrames", () => {
+  it("merges small chunks up to the frame limit", () => {
+    const frames = coalesceFrames(
+      [
+        new Uint8Array([1, 2]),
+        new Uint8Array([3]),
+        new Uint8Array([4, 5]),
+        new Uint8Array([6]),
+      ],
+      3,
+    );
+    expect(frames).toEqual([
+      new Uint8Array([1, 2, 3]),
+      new Uint8Array([4, 5, 6]),
+    ]);
+  });
+
+  it("keeps oversized and lone chunks as they are", () => {
+    const big = new Uint8Array([1, 2, 3, 4]);
+    const small = new Uint8Array([5]);
+    const frames = coalesceFrames([big, small], 3);
+    expect(frames[0]).toBe(big);
+    expect(frames[1]).toBe(small);
+  });
+});
@@ -1,32 +1,9 @@
 import { z } from "zod";
-import { DOMParser } from "@b-fuze/deno-dom";
 import { getLogger } from "../_utils/logger.ts";
 import type { ToolSchema } from "./types.ts";
 
 const log = getLogger("builtin-tools");
 
-export function htmlToText(html: string): string {
-  const doc = new DOMParser().parseFromString(html, "text/html");
-  if (!doc) return "";
-  for (const tag of ["script", "style", "head"]) {
-    for (const el of doc.querySelectorAll(tag)) el.remove();
-  }
-  for (
-    const el of doc.querySelectorAll(
-      "p,div,h1,h2,h3,h4,h5,h6,li,tr,blockquote",
-    )
-  ) {
-    el.append("\n");
-  }
-  for (const el of doc.querySelectorAll("br")) el.replaceWith("\n");
-  const text = doc.body?.textContent ?? doc.textContent ?? "";
-  return text
-    .replace(/[ \t]+/g, " ")
-    .replace(/\n[ \t]+/g, "\n")
-    .replace(/\n{3,}/g, "\n\n")
-    .trim();
-}
-
 interface BuiltinTool {
   name: string;
   description: string;
@@ -34,9 +11,16 @@ interface BuiltinTool {
   execute: (
     args: Record<string, unknown>,
     env: Record<string, string | undefined>,
+    signal: AbortSignal,
   ) => Promise<string>;
 }
 
+/** Upper bound on any builtin tool call; run_code also has its own, shorter. */
+const TOOL_TIMEOUT_MS = 15_000;
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder();
+
 const webSearchParams = z.object({
   query: z.string().describe("The search query"),
   max_results: z
@@ -52,7 +36,7 @@ const webSearch: BuiltinTool = {
   description:
     "Search the web using Brave Search. Returns a list of results with title, URL, and description.",
   parameters: webSearchParams,
-  execute: async (args, env) => {
+  execute: async (args, env, signal) => {
     const { query, max_results } = args as z.infer<typeof webSearchParams>;
     const maxResults = max_results ?? 5;
 
@@ -74,7 +58,7 @@ const webSearch: BuiltinTool = {
 
     const resp = await fetch(url, {
       headers: { "X-Subscription-Token": apiKey },
-      signal: AbortSignal.timeout(15_000),
+      signal,
     });
 
     if (!resp.ok) {
@@ -115,7 +99,7 @@ const visitWebpage: BuiltinTool = {
   description:
     "Fetch a webpage URL and return its content as clean Markdown. Useful for reading articles, documentation, or any web page found via search.",
   parameters: visitWebpageParams,
-  execute: async (args, _env) => {
+  execute: async (args, _env, signal) => {
     const { url } = args as z.infer<typeof visitWebpageParams>;
 
     log.info("visit_webpage", { url });
@@ -128,7 +112,7 @@ const visitWebpage: BuiltinTool = {
           "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
       },
       redirect: "follow",
-      signal: AbortSignal.timeout(15_000),
+      signal,
     });
 
     if (!resp.ok) {
@@ -139,6 +123,9 @@ const visitWebpage: BuiltinTool = {
     }
 
     const htmlContent = await resp.text();
+    // deno-dom is large and only this tool needs it, so it loads on first
+    // use instead of with every importer of this module.
+    const { htmlToText } = await import("./html_to_text.ts");
     const markdown = htmlToText(htmlContent);
 
     const truncated = markdown.length > MAX_PAGE_CHARS;
@@ -165,7 +152,7 @@ const runCode: BuiltinTool = {
   description:
     "Execute JavaScript in a sandboxed Deno subprocess with no permissions. Use console.log() for output. No network or filesystem access.",
   parameters: runCodeParams,
-  execute: async (args, _env) => {
+  execute: async (args, _env, signal) => {
     const { code } = args as z.infer<typeof runCodeParams>;
 
     log.info("run_code", { codeLength: code.length });
@@ -189,17 +176,30 @@ const runCode: BuiltinTool = {
 
     const proc = cmd.spawn();
     const writer = proc.stdin.getWriter();
-    await writer.write(new TextEncoder().encode(code));
+    await writer.write(encoder.encode(code));
     await writer.close();
 
-    const timer = setTimeout(() => proc.kill(), TIMEOUT_MS);
+    // The timer and an abort can both fire; killing an exited process throws.
+    let killed = false;
+    const kill = () => {
+      if (killed) return;
+      killed = true;
+      try {
+        proc.kill();
+      } catch {
+        // already exited
+      }
+    };
+    const timer = setTimeout(kill, TIMEOUT_MS);
+    signal.addEventListener("abort", kill, { once: true });
 
     try {
       const { code: exit, stdout, stderr } = await proc.output();
       clearTimeout(timer);
+      signal.removeEventListener("abort", kill);
 
-      const out = new TextDecoder().decode(stdout).trim();
-      const err = new TextDecoder().decode(stderr).trim();
+      const out = decoder.decode(stdout).trim();
+      const err = decoder.decode(stderr).trim();
 
       if (exit !== 0) {
         return JSON.stringify({ error: err || "Execution failed" });
@@ -207,6 +207,7 @@ const runCode: BuiltinTool = {
       return out || "Code ran successfully (no output)";
     } catch {
       clearTimeout(timer);
+      signal.removeEventListener("abort", kill);
       return JSON.stringify({ error: "Execution timed out" });
     }
   },
@@ -224,14 +225,14 @@ const fetchJson: BuiltinTool = {
   description:
     "Fetch a URL via HTTP GET and return the JSON response. Useful for calling REST APIs that return JSON data.",
   parameters: fetchJsonParams,
-  execute: async (args, _env) => {
+  execute: async (args, _env, signal) => {
     const { url, headers } = args as z.infer<typeof fetchJsonParams>;
 
     log.info("fetch_json", { url });
 
     const resp = await fetch(url, {
       headers,
-      signal: AbortSignal.timeout(15_000),
+      signal,
     });
 
     if (!resp.ok) {
@@ -282,16 +283,28 @@ const BUILTIN_TOOLS: Record<string, BuiltinTool> = {
   final_answer: finalAnswer,
 };
 
+// Built-in tool definitions are static, so each JSON schema is converted
+// once and shared by every agent and session that enables the tool.
+const schemaCache = new Map<string, ToolSchema>();
+
+function builtinToolSchema(tool: BuiltinTool): ToolSchema {
+  let schema = schemaCache.get(tool.name);
+  if (!schema) {
+    schema = {
+      name: tool.name,
+      description: tool.description,
+      parameters: z.toJSONSchema(tool.parameters) as Record<string, unknown>,
+    };
+    schemaCache.set(tool.name, schema);
+  }
+  return schema;
+}
+
 export function getBuiltinToolSchemas(names: string[]): ToolSchema[] {
   const allNames = [...new Set([...REQUIRED_BUILTIN_TOOLS, ...names])];
   return allNames.flatMap((name) => {
     const tool = BUILTIN_TOOLS[name];
-    if (!tool) return [];
-    return [{
-      name: tool.name,
-      description: tool.description,
-      parameters: z.toJSONSchema(tool.parameters) as Record<string, unknown>,
-    }];
+    return tool ? [builtinToolSchema(tool)] : [];
   });
 }
 
@@ -299,6 +312,7 @@ export async function executeBuiltinTool(
   name: string,
   args: Record<string, unknown>,
   env: Record<string, string | undefined> = {},
+  signal?: AbortSignal,
 ): Promise<string | null> {
   const tool = BUILTIN_TOOLS[name];
   if (!tool) return null;
@@ -310,7 +324,14 @@ export async function executeBuiltinTool(
   }
 
   try {
-    return await tool.execute(parsed.data as Record<string, unknown>, env);
+    // Bound each call by its own timeout and by the caller's turn, so a
+    // barge-in stops the request instead of letting it run to completion.
+    const timeout = AbortSignal.timeout(TOOL_TIMEOUT_MS);
+    return await tool.execute(
+      parsed.data as Record<string, unknown>,
+      env,
+      signal ? AbortSignal.any([signal, timeout]) : timeout,
+    );
   } catch (err) {
     log.error("Built-in tool execution failed", { err, tool: name });
     return `Error: ${err instanceof Error ? err.message : String(err)}`;
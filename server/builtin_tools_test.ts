@@ -1,79 +1,14 @@
 import { afterEach, beforeEach, describe, it } from "@std/testing/bdd";
 import { expect } from "@std/expect";
-import {
-  executeBuiltinTool,
-  getBuiltinToolSchemas,
-  htmlToText,
-} from "./builtin_tools.ts";
+import { executeBuiltinTool, getBuiltinToolSchemas } from "./builtin_tools.ts";
 
-describe("htmlToText", () => {
-  it("strips script tags", () => {
-    const result = htmlToText('<p>Hello</p><script>alert("x")</script>');
-    expect(result).toBe("Hello");
-  });
-
-  it("strips style tags", () => {
-    const result = htmlToText(
-      "<style>body{color:red}</style><p>Content</p>",
-    );
-    expect(result).toBe("Content");
-  });
-
-  it("strips head tags", () => {
-    const result = htmlToText(
-      "<head><title>Test</title></head><body>Body</body>",
-    );
-    expect(result).not.toContain("Test");
-    expect(result).toContain("Body");
-  });
-
-  it("converts block tags to newlines", () => {
-    const result = htmlToText("<p>Para 1</p><p>Para 2</p>");
-    expect(result).toContain("Para 1");
-    expect(result).toContain("Para 2");
-  });
-
-  it("converts br to newlines", () => {
-    const result = htmlToText("Line 1<br>Line 2<br/>Line 3");
-    expect(result).toContain("Line 1");
-    expect(result).toContain("Line 2");
-    expect(result).toContain("Line 3");
-  });
-
-  it("strips remaining HTML tags", () => {
-    const result = htmlToText("<span class='x'>Hello</span> <b>World</b>");
-    expect(result).not.toContain("<");
-    expect(result).not.toContain(">");
-    expect(result).toContain("Hello");
-    expect(result).toContain("World");
-  });
-
-  it("decodes HTML entities", () => {
-    const result = htmlToText("&amp; &lt; &gt; &quot; &#39; &nbsp;");
-    expect(result).toContain("&");
-    expect(result).toContain("<");
-    expect(result).toContain(">");
-    expect(result).toContain('"');
-    expect(result).toContain("'");
-  });
-
-  it("collapses whitespace", () => {
-    const result = htmlToText("<p>  too   many   spaces  </p>");
-    expect(result).not.toContain("  ");
-  });
-
-  it("collapses excessive newlines", () => {
-    const result = htmlToText("<p>A</p>\n\n\n\n<p>B</p>");
-    expect(result).not.toMatch(/\n{3,}/);
-  });
-
-  it("trims result", () => {
-    const result = htmlToText("  <p>Hello</p>  ");
-    expect(result).toBe(result.trim());
+describe("getBuiltinToolSchemas", () => {
+  it("reuses converted schemas across calls", () => {
+    const [first] = getBuiltinToolSchemas(["web_search"]);
+    const [second] = getBuiltinToolSchemas([]);
+    expect(second).toBe(first);
   });
-});
 
-describe("getBuiltinToolSchemas", () => {
   it("returns schemas for known tools plus required tools", () => {
     const schemas = getBuiltinToolSchemas([
       "web_search",
@@ -239,6 +174,25 @@ describe("executeBuiltinTool", () => {
       globalThis.fetch = originalFetch;
     });
 
+    it("aborts the request when the caller's signal aborts", async () => {
+      let seen: AbortSignal | undefined;
+      globalThis.fetch = ((_url: string, init?: RequestInit) => {
+        seen = init?.signal ?? undefined;
+        return Promise.resolve(new Response("{}", { status: 200 }));
+      }) as typeof globalThis.fetch;
+
+      const controller = new AbortController();
+      await executeBuiltinTool(
+        "fetch_json",
+        { url: "https://api.example.com/data" },
+        {},
+        controller.signal,
+      );
+      expect(seen?.aborted).toBe(false);
+      controller.abort();
+      expect(seen?.aborted).toBe(true);
+    });
+
     it("fetches and returns JSON", async () => {
       globalThis.fetch = (() =>
         Promise.resolve(
@@ -0,0 +1,23 @@
+import { DOMParser } from "@b-fuze/deno-dom";
+
+export function htmlToText(html: string): string {
+  const doc = new DOMParser().parseFromString(html, "text/html");
+  if (!doc) return "";
+  for (const tag of ["script", "style", "head"]) {
+    for (const el of doc.querySelectorAll(tag)) el.remove();
+  }
+  for (
+    const el of doc.querySelectorAll(
+      "p,div,h1,h2,h3,h4,h5,h6,li,tr,blockquote",
+    )
+  ) {
+    el.append("\n");
+  }
+  for (const el of doc.querySelectorAll("br")) el.replaceWith("\n");
+  const text = doc.body?.textContent ?? doc.textContent ?? "";
+  return text
+    .replace(/[ \t]+/g, " ")
+    .replace(/\n[ \t]+/g, "\n")
+    .replace(/\n{3,}/g, "\n\n")
+    .trim();
+}
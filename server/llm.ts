@@ -5,14 +5,66 @@ import {
   LLMResponseSchema,
   type ToolSchema,
 } from "./types.ts";
+import { FINAL_ANSWER_TOOL } from "./turn_handler.ts";
 
+const NON_WHITESPACE = /\S/;
+
+function needsPatch(msg: ChatMessage): boolean {
+  // Regex test stops at the first visible character and, unlike trim(),
+  // never copies the (possibly large) content.
+  return typeof msg.content === "string" && !NON_WHITESPACE.test(msg.content);
+}
+
+/**
+ * Returns `messages` itself unless some message has blank content, in which
+ * case a copy is started at the first blank one. Single pass either way.
+ */
 function sanitizeMessages(messages: ChatMessage[]): ChatMessage[] {
-  return messages.map((msg) => {
-    if (typeof msg.content === "string" && !msg.content.trim()) {
-      return { ...msg, content: "..." };
+  let out: ChatMessage[] | null = null;
+  for (let i = 0; i < messages.length; i++) {
+    const msg = messages[i];
+    if (needsPatch(msg)) {
+      out ??= messages.slice(0, i);
+      out.push({ ...msg, content: "..." });
+    } else if (out) {
+      out.push(msg);
     }
-    return msg;
-  });
+  }
+  return out ?? messages;
+}
+
+const EPHEMERAL_CACHE = { type: "ephemeral" } as const;
+
+function cacheBreakpoint(msg: ChatMessage): unknown {
+  if (typeof msg.content !== "string") return msg;
+  return {
+    ...msg,
+    content: [{
+      type: "text",
+      text: msg.content,
+      cache_control: EPHEMERAL_CACHE,
+    }],
+  };
+}
+
+/**
+ * Marks prompt-cache breakpoints for Claude models: the system prompt, which
+ * is identical across turns and sessions, and the last two user messages.
+ * The latest user message writes the conversation so far to the cache; on
+ * the next turn it is the second-to-last one and reads it back.
+ */
+function withPromptCache(messages: ChatMessage[], model: string): unknown[] {
+  if (!model.startsWith("claude")) return messages;
+  const marked = new Set<number>();
+  if (messages[0]?.role === "system") marked.add(0);
+  let users = 0;
+  for (let i = messages.length - 1; i > 0 && users < 2; i--) {
+    if (messages[i].role === "user") {
+      marked.add(i);
+      users++;
+    }
+  }
+  return messages.map((msg, i) => marked.has(i) ? cacheBreakpoint(msg) : msg);
 }
 
 export interface CallLLMOptions {
@@ -29,6 +81,13 @@ export interface CallLLMOptions {
     | "required"
     | { type: "function"; function: { name: string } };
   maxTokens?: number;
+  /**
+   * Receives the spoken answer as it is generated: plain content when no
+   * tools are offered, otherwise the `answer` argument of `final_answer`.
+   * Setting it switches the request to server-sent events. If it returns a
+   * promise, reading the stream pauses until it settles.
+   */
+  onText?: (delta: string) => void | Promise<void>;
 }
 
 export async function callLLM(opts: CallLLMOptions): Promise<LLMResponse> {
@@ -37,10 +96,12 @@ export async function callLLM(opts: CallLLMOptions): Promise<LLMResponse> {
 
   const body: Record<string, unknown> = {
     model: opts.model,
-    messages: sanitizeMessages(opts.messages),
+    messages: withPromptCache(sanitizeMessages(opts.messages), opts.model),
     max_tokens: opts.maxTokens ?? 300,
   };
 
+  if (opts.onText) body.stream = true;
+
   if (opts.tools.length > 0) {
     body.tools = opts.tools.map((t) => ({
       type: "function",
@@ -68,6 +129,16 @@ export async function callLLM(opts: CallLLMOptions): Promise<LLMResponse> {
     throw new Error(ERR_INTERNAL.llmRequestFailed(resp.status, text));
   }
 
+  // Gateways may ignore `stream: true`; only parse SSE when that is what
+  // came back, and read plain JSON bodies directly otherwise.
+  const isEventStream = resp.headers.get("content-type")?.startsWith(
+    "text/event-stream",
+  );
+  if (opts.onText && isEventStream && resp.body) {
+    // Assembled locally in the response shape, so it skips validation.
+    return await readStream(resp.body, opts.tools.length > 0, opts.onText);
+  }
+
   const json = await resp.json();
   const parsed = LLMResponseSchema.safeParse(json);
   if (!parsed.success) {
@@ -75,3 +146,157 @@ export async function callLLM(opts: CallLLMOptions): Promise<LLMResponse> {
   }
   return parsed.data;
 }
+
+/**
+ * Incrementally decodes the `answer` string out of partial `final_answer`
+ * arguments JSON, so text can be spoken before the tool call is complete.
+ */
+class AnswerExtractor {
+  private buf = "";
+  private pos = -1;
+  private done = false;
+
+  push(fragment: string): string {
+    if (this.done) return "";
+    this.buf += fragment;
+    if (this.pos < 0) {
+      const m = /"answer"\s*:\s*"/.exec(this.buf);
+      if (!m) return "";
+      this.pos = m.index + m[0].length;
+    }
+
+    let out = "";
+    while (this.pos < this.buf.length) {
+      const ch = this.buf[this.pos];
+      if (ch === '"') {
+        this.done = true;
+        break;
+      }
+      if (ch !== "\\") {
+        out += ch;
+        this.pos++;
+        continue;
+      }
+      // Escape sequence — wait until it has fully arrived.
+      const len = this.buf[this.pos + 1] === "u" ? 6 : 2;
+      if (this.pos + len > this.buf.length) break;
+      try {
+        out += JSON.parse(`"${this.buf.slice(this.pos, this.pos + len)}"`);
+      } catch {
+        // Malformed escape; drop it rather than speak it.
+      }
+      this.pos += len;
+    }
+    return out;
+  }
+}
+
+interface StreamToolCall {
+  index: number;
+  id?: string;
+  function?: { name?: string; arguments?: string };
+}
+
+interface StreamChunk {
+  id?: string;
+  choices?: {
+    delta?: { content?: string | null; tool_calls?: StreamToolCall[] };
+    finish_reason?: string | null;
+  }[];
+}
+
+/** Folds an SSE chat completion stream back into a regular response body. */
+async function readStream(
+  stream: ReadableStream<Uint8Array>,
+  hasTools: boolean,
+  onText: (delta: string) => void | Promise<void>,
+): Promise<LLMResponse> {
+  let id: string | undefined;
+  let content = "";
+  let finishReason = "stop";
+  const toolCalls: {
+    id: string;
+    name: string;
+    arguments: string;
+    answer?: AnswerExtractor;
+  }[] = [];
+  const waits: Promise<void>[] = [];
+  const emit = (text: string) => {
+    const wait = onText(text);
+    if (wait) waits.push(wait);
+  };
+
+  const handle = (chunk: StreamChunk) => {
+    id ??= chunk.id;
+    const choice = chunk.choices?.[0];
+    if (!choice) return;
+    if (choice.finish_reason) finishReason = choice.finish_reason;
+    const delta = choice.delta;
+    if (!delta) return;
+
+    if (delta.content) {
+      content += delta.content;
+      if (!hasTools) emit(delta.content);
+    }
+    for (const tc of delta.tool_calls ?? []) {
+      const call = toolCalls[tc.index] ??= { id: "", name: "", arguments: "" };
+      if (tc.id) call.id = tc.id;
+      if (tc.function?.name) {
+        call.name += tc.function.name;
+        if (call.name === FINAL_ANSWER_TOOL) {
+          call.answer ??= new AnswerExtractor();
+        }
+      }
+      const args = tc.function?.arguments;
+      if (args) {
+        call.arguments += args;
+        const text = call.answer?.push(args);
+        if (text) emit(text);
+      }
+    }
+  };
+
+  let pending = "";
+  const decoder = new TextDecoder();
+  const feed = (text: string) => {
+    pending += text;
+    let nl: number;
+    while ((nl = pending.indexOf("\n")) >= 0) {
+      const line = pending.slice(0, nl).trim();
+      pending = pending.slice(nl + 1);
+      if (!line.startsWith("data:")) continue;
+      const data = line.slice(5).trim();
+      if (data === "[DONE]") continue;
+      handle(JSON.parse(data) as StreamChunk);
+    }
+  };
+  for await (const bytes of stream) {
+    feed(decoder.decode(bytes, { stream: true }));
+    if (waits.length > 0) {
+      await Promise.all(waits);
+      waits.length = 0;
+    }
+  }
+  feed(decoder.decode() + "\n");
+
+  return {
+    id,
+    choices: [{
+      index: 0,
+      message: {
+        role: "assistant" as const,
+        content: content || null,
+        ...(toolCalls.length > 0
+          ? {
+            tool_calls: toolCalls.map((c) => ({
+              id: c.id,
+              type: "function" as const,
+              function: { name: c.name, arguments: c.arguments },
+            })),
+          }
+          : {}),
+      },
+      finish_reason: finishReason,
+    }],
+  };
+}
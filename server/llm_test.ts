@@ -106,6 +106,70 @@ describe("callLLM", () => {
     expect(body.messages[1].content).toBe("...");
   });
 
+  it("sends messages unchanged when none are blank", async () => {
+    mockFetch(validResponse);
+    await callLLM({ messages, tools: [], apiKey: "key", model: "model" });
+
+    const body = JSON.parse(lastRequest!.init.body as string);
+    expect(body.messages).toEqual(messages);
+  });
+
+  it("re-sanitizes blank messages on every call", async () => {
+    mockFetch(validResponse);
+    const msgs: ChatMessage[] = [{ role: "user", content: "" }];
+    await callLLM({ messages: msgs, tools: [], apiKey: "key", model: "m" });
+    msgs.push({ role: "user", content: "Hi" });
+    await callLLM({ messages: msgs, tools: [], apiKey: "key", model: "m" });
+
+    const body = JSON.parse(lastRequest!.init.body as string);
+    expect(body.messages.map((m: ChatMessage) => m.content)).toEqual([
+      "...",
+      "Hi",
+    ]);
+  });
+
+  it("marks the system prompt cacheable for Claude models", async () => {
+    mockFetch(validResponse);
+    await callLLM({
+      messages,
+      tools: [],
+      apiKey: "key",
+      model: "claude-haiku-4-5-20251001",
+    });
+
+    const body = JSON.parse(lastRequest!.init.body as string);
+    expect(body.messages[0].content).toEqual([{
+      type: "text",
+      text: "You are helpful.",
+      cache_control: { type: "ephemeral" },
+    }]);
+  });
+
+  it("marks the last two user messages cacheable for Claude models", async () => {
+    mockFetch(validResponse);
+    const conversation: ChatMessage[] = [
+      { role: "system", content: "You are helpful." },
+      { role: "user", content: "One" },
+      { role: "assistant", content: "A" },
+      { role: "user", content: "Two" },
+      { role: "assistant", content: "B" },
+      { role: "user", content: "Three" },
+    ];
+    await callLLM({
+      messages: conversation,
+      tools: [],
+      apiKey: "key",
+      model: "claude-haiku-4-5-20251001",
+    });
+
+    const body = JSON.parse(lastRequest!.init.body as string);
+    const cached = body.messages.map((m: { content: unknown }) =>
+      Array.isArray(m.content)
+    );
+    expect(cached).toEqual([true, false, false, true, false, true]);
+    expect(body.messages[5].content[0].text).toBe("Three");
+  });
+
   it("includes tools when provided", async () => {
     mockFetch(validResponse);
     const tools: ToolSchema[] = [
@@ -211,4 +275,110 @@ describe("callLLM", () => {
 
     expect(customFetchCalled).toBe(true);
   });
+
+  describe("streaming", () => {
+    function mockFetchSse(chunks: unknown[]): void {
+      const body = chunks.map((c) => `data: ${JSON.stringify(c)}\n\n`)
+        .join("") + "data: [DONE]\n\n";
+      globalThis.fetch = ((
+        _input: string | URL | Request,
+        init?: RequestInit,
+      ) => {
+        lastRequest = { url: "", init: init ?? {} };
+        return Promise.resolve(
+          new Response(body, {
+            headers: { "Content-Type": "text/event-stream" },
+          }),
+        );
+      }) as typeof globalThis.fetch;
+    }
+
+    it("streams content deltas when no tools are offered", async () => {
+      mockFetchSse([
+        { id: "s1", choices: [{ delta: { content: "Hel" } }] },
+        { choices: [{ delta: { content: "lo!" }, finish_reason: "stop" }] },
+      ]);
+      const deltas: string[] = [];
+      const result = await callLLM({
+        messages,
+        tools: [],
+        apiKey: "key",
+        model: "model",
+        onText: (d) => deltas.push(d),
+      });
+
+      expect(JSON.parse(lastRequest!.init.body as string).stream).toBe(true);
+      expect(deltas).toEqual(["Hel", "lo!"]);
+      expect(result.id).toBe("s1");
+      expect(result.choices[0].message.content).toBe("Hello!");
+      expect(result.choices[0].finish_reason).toBe("stop");
+    });
+
+    it("reads a plain JSON reply to a streaming request", async () => {
+      mockFetch(validResponse);
+      const deltas: string[] = [];
+      const result = await callLLM({
+        messages,
+        tools: [],
+        apiKey: "key",
+        model: "model",
+        onText: (d) => deltas.push(d),
+      });
+
+      expect(deltas).toEqual([]);
+      expect(result.choices[0].message.content).toBe("Hello!");
+    });
+
+    it("streams final_answer text and assembles tool calls", async () => {
+      const tools: ToolSchema[] = [
+        { name: "final_answer", description: "Answer", parameters: {} },
+      ];
+      mockFetchSse([
+        {
+          choices: [{
+            delta: {
+              tool_calls: [{
+                index: 0,
+                id: "c1",
+                function: { name: "final_answer", arguments: '{"ans' },
+              }],
+            },
+          }],
+        },
+        {
+          choices: [{
+            delta: {
+              tool_calls: [{
+                index: 0,
+                function: { arguments: 'wer": "Say \\"hi' },
+              }],
+            },
+          }],
+        },
+        {
+          choices: [{
+            delta: {
+              tool_calls: [{ index: 0, function: { arguments: '\\"."}' } }],
+            },
+            finish_reason: "tool_calls",
+          }],
+        },
+      ]);
+      const deltas: string[] = [];
+      const result = await callLLM({
+        messages,
+        tools,
+        apiKey: "key",
+        model: "model",
+        onText: (d) => deltas.push(d),
+      });
+
+      expect(deltas.join("")).toBe('Say "hi".');
+      const call = result.choices[0].message.tool_calls![0];
+      expect(call.id).toBe("c1");
+      expect(call.function.name).toBe("final_answer");
+      expect(JSON.parse(call.function.arguments).answer).toBe('Say "hi".');
+      expect(result.choices[0].finish_reason).toBe("tool_calls");
+    });
+  });
 });
@@ -16,6 +16,11 @@ export {
   type WsSessionOptions,
 } from "./ws_handler.ts";
 export { applyMiddleware } from "./middleware.ts";
+export {
+  executeTurns,
+  type TurnContext,
+  type TurnResult,
+} from "./turn_handler.ts";
 export { FAVICON_SVG, renderAgentPage } from "../ui/html.ts";
 export { agentToolsToSchemas } from "./protocol.ts";
 export { ERR, ERR_INTERNAL } from "./errors.ts";
@@ -0,0 +1,52 @@
+import { LruCache } from "../_utils/lru_cache.ts";
+import { FINAL_ANSWER_STEP, type TurnResult } from "./turn_handler.ts";
+
+export const DEFAULT_RESPONSE_CACHE_SIZE = 256;
+
+/**
+ * Folds case, spacing and trailing sentence punctuation so trivial variants
+ * share a key. Other symbols are kept: "2+2" and "2-2" are different
+ * questions.
+ */
+export function normalizeUtterance(text: string): string {
+  return text
+    .toLowerCase()
+    .replace(/\s+/g, " ")
+    .replace(/[\s.?!,]+$/, "")
+    .trim();
+}
+
+/**
+ * LRU cache of opening-turn responses, shared by every session of an agent.
+ *
+ * Only turns answered without tools are stored — tool results are live data
+ * and must not be replayed.
+ */
+export class ResponseCache {
+  readonly #entries: LruCache<string, TurnResult>;
+
+  constructor(maxEntries = DEFAULT_RESPONSE_CACHE_SIZE) {
+    this.#entries = new LruCache(maxEntries);
+  }
+
+  get size(): number {
+    return this.#entries.size;
+  }
+
+  get(text: string): TurnResult | undefined {
+    return this.#entries.get(normalizeUtterance(text));
+  }
+
+  set(text: string, result: TurnResult): void {
+    if (!result.text) return;
+    if (!result.steps.every((s) => s === FINAL_ANSWER_STEP)) return;
+
+    const key = normalizeUtterance(text);
+    if (!key) return;
+    this.#entries.set(key, result);
+  }
+
+  clear(): void {
+    this.#entries.clear();
+  }
+}
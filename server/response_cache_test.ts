@@ -0,0 +1,58 @@
+import { describe, it } from "@std/testing/bdd";
+import { expect } from "@std/expect";
+import { normalizeUtterance, ResponseCache } from "./response_cache.ts";
+
+describe("normalizeUtterance", () => {
+  it("folds case, whitespace and trailing punctuation", () => {
+    expect(normalizeUtterance("  Hello,   there! ")).toBe("hello, there");
+    expect(normalizeUtterance("What's up?")).toBe("what's up");
+  });
+
+  it("keeps operators and symbols that change the question", () => {
+    const pairs = [
+      ["what's 2+2", "what's 2-2"],
+      ["is 5 > 3", "is 5 < 3"],
+      ["$5", "5%"],
+    ];
+    for (const [a, b] of pairs) {
+      expect(normalizeUtterance(a)).not.toBe(normalizeUtterance(b));
+    }
+  });
+});
+
+describe("ResponseCache", () => {
+  const answer = { text: "Hi.", steps: ["Using final_answer"] };
+
+  it("returns stored responses for normalized repeats", () => {
+    const cache = new ResponseCache();
+    cache.set("Hello there", answer);
+    expect(cache.get("hello there!")).toEqual(answer);
+    expect(cache.get("goodbye")).toBeUndefined();
+  });
+
+  it("skips responses that used tools", () => {
+    const cache = new ResponseCache();
+    cache.set("weather", {
+      text: "Sunny.",
+      steps: ["Using web_search", "Using final_answer"],
+    });
+    expect(cache.size).toBe(0);
+  });
+
+  it("skips empty responses", () => {
+    const cache = new ResponseCache();
+    cache.set("hello", { text: "", steps: [] });
+    expect(cache.size).toBe(0);
+  });
+
+  it("evicts the least recently used entry", () => {
+    const cache = new ResponseCache(2);
+    cache.set("a", answer);
+    cache.set("b", answer);
+    cache.get("a");
+    cache.set("c", answer);
+    expect(cache.get("a")).toBeDefined();
+    expect(cache.get("b")).toBeUndefined();
+    expect(cache.get("c")).toBeDefined();
+  });
+});
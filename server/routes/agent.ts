@@ -16,6 +16,19 @@ import {
 
 const log = getLogger("agent-routes");
 
+// The page depends only on the agent's name and slug, so it is rendered
+// once per loaded agent rather than on every request.
+const pages = new WeakMap<AgentInfo, string>();
+
+function agentPage(info: AgentInfo): string {
+  let page = pages.get(info);
+  if (page === undefined) {
+    page = renderAgentPage(info.name, `/${info.slug}`);
+    pages.set(info, page);
+  }
+  return page;
+}
+
 export function createAgentRoutes(ctx: {
   slots: Map<string, AgentSlot>;
   agents: AgentInfo[];
@@ -33,7 +46,7 @@ export function createAgentRoutes(ctx: {
     try {
       const info = await ensureAgent(slot, bundleDir);
       if (!agents.includes(info)) agents.push(info);
-      return c.html(renderAgentPage(info.name, `/${slug}`));
+      return c.html(agentPage(info));
     } catch (err) {
       log.error("Failed to initialize agent", { slug, err });
       throw new HTTPException(500, {
@@ -81,7 +94,13 @@ export function createAgentRoutes(ctx: {
           ws,
           info.config,
           info.toolSchemas,
-          { platformConfig: slot.platformConfig, executeTool, secrets: slot.env },
+          {
+            platformConfig: slot.platformConfig,
+            executeTool,
+            secrets: slot.env,
+            responseCache: info.responseCache,
+            audioCache: info.audioCache,
+          },
         );
       },
       logContext: { slug: info.slug },
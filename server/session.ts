@@ -8,9 +8,17 @@ import {
   type SttEvents,
   type SttHandle,
 } from "./stt.ts";
-import { type ITtsClient, TtsClient } from "./tts.ts";
-import { executeBuiltinTool as defaultExecuteBuiltinTool } from "./builtin_tools.ts";
-import { executeTurn, type TurnContext } from "./turn_handler.ts";
+import { type ITtsClient, TtsClient, type TtsText } from "./tts.ts";
+import { TextQueue } from "./text_queue.ts";
+import {
+  executeTurn,
+  FINAL_ANSWER_TOOL,
+  trimHistory,
+  type TurnContext,
+  type TurnResult,
+} from "./turn_handler.ts";
+import type { ResponseCache } from "./response_cache.ts";
+import { type AudioCache, coalesceFrames } from "./audio_cache.ts";
 import type {
   AgentConfig,
   ChatMessage,
@@ -20,6 +28,15 @@ import type {
 } from "./types.ts";
 import { DEFAULT_GREETING, DEFAULT_INSTRUCTIONS } from "./agent_types.ts";
 
+// Control messages without fields never change, so each is serialized once.
+const FRAME = {
+  cancelled: JSON.stringify({ type: "cancelled" }),
+  reset: JSON.stringify({ type: "reset" }),
+  speaking: JSON.stringify({ type: "speaking" }),
+  thinking: JSON.stringify({ type: "thinking" }),
+  ttsDone: JSON.stringify({ type: "tts_done" }),
+} as const;
+
 const VOICE_RULES =
   "\n\nCRITICAL OUTPUT RULES — you MUST follow these for EVERY response:\n" +
   "Your response will be spoken aloud by a TTS system and displayed as plain text.\n" +
@@ -32,6 +49,54 @@ const VOICE_RULES =
   '- Use short conversational sentences. To list things, say "First," "Next," "Finally,"\n' +
   "- Keep responses concise — a few sentences max";
 
+const TOOL_REMINDER =
+  "\n\nAnswer the user's request using relevant tools (if they are available). " +
+  "Before calling a tool, do some analysis. " +
+  "First, think about which of the provided tools is the relevant tool to answer the user's request. " +
+  "Second, go through each of the required parameters of the relevant tool and determine if the user has directly provided or given enough information to infer a value. " +
+  "When deciding if the parameter can be inferred, carefully consider all the context to see if it supports a specific value. " +
+  "If all of the required parameters are present or can be reasonably inferred, proceed with the tool call. " +
+  "BUT, if one of the values for a required parameter is missing, DO NOT invoke the function (not even with fillers for the missing params) and instead, ask the user to provide the missing parameters. " +
+  "DO NOT ask for more information on optional parameters if it is not provided. " +
+  "Do not answer from memory alone when a tool can provide accurate, up-to-date information." +
+  "\n\nIMPORTANT: You MUST call the final_answer tool to deliver every response. " +
+  "Put your complete spoken response in the answer parameter. " +
+  "It is the only way to complete the task — otherwise you will be stuck in a loop.";
+
+/** User turns kept in the LLM context; older turns are dropped. */
+const MAX_HISTORY_TURNS = 16;
+
+/** Sentences the LLM may get ahead of TTS before its stream is paused. */
+const MAX_PENDING_SENTENCES = 4;
+
+/** System prompt for an agent: base rules, agent instructions, tool rules. */
+export function buildSystemPrompt(
+  config: AgentConfig,
+  hasTools: boolean,
+): string {
+  const agentInstructions = config.instructions
+    ? `\n\nAgent-Specific Instructions:\n${config.instructions}`
+    : "";
+  const toolReminder = hasTools ? TOOL_REMINDER : "";
+  return DEFAULT_INSTRUCTIONS + agentInstructions + toolReminder +
+    VOICE_RULES;
+}
+
+/**
+ * Restricts `execute` to final_answer and the builtin tools `config`
+ * enables. Any other name resolves to null and falls through to the
+ * agent's own tools, so a hallucinated call cannot reach a builtin the
+ * agent never turned on.
+ */
+export function enabledBuiltinTools(
+  config: AgentConfig,
+  execute: TurnContext["executeBuiltinTool"],
+): TurnContext["executeBuiltinTool"] {
+  const names = new Set([FINAL_ANSWER_TOOL, ...(config.builtinTools ?? [])]);
+  return (name, args, signal) =>
+    names.has(name) ? execute(name, args, signal) : Promise.resolve(null);
+}
+
 export interface SessionTransport {
   send(data: string | ArrayBuffer | Uint8Array): void;
   readonly readyState: number;
@@ -50,12 +115,14 @@ export interface SessionDeps {
   executeBuiltinTool(
     name: string,
     args: Record<string, unknown>,
+    signal?: AbortSignal,
   ): Promise<string | null>;
+  responseCache?: ResponseCache;
+  audioCache?: AudioCache;
 }
 
 export class ServerSession {
   private id: string;
-  private agentConfig: AgentConfig;
   private deps: SessionDeps;
   private browserWs: SessionTransport;
   private logger: Logger;
@@ -65,9 +132,11 @@ export class ServerSession {
   private ttsPromise: Promise<void> | null = null;
   private messages: ChatMessage[] = [];
   private toolSchemas: ToolSchema[];
+  private executeBuiltinTool: TurnContext["executeBuiltinTool"];
   private stopped = false;
   private audioFrameCount = 0;
-  private pendingGreeting: string | null = null;
+  private greeting: string;
+  private greetingPending = false;
 
   public turnPromise: Promise<void> | null = null;
 
@@ -80,55 +149,46 @@ export class ServerSession {
   ) {
     this.id = id;
     this.browserWs = browserWs;
-    this.agentConfig = config;
     this.logger = getLogger(`session:${id.slice(0, 8)}`);
     this.deps = {
       ...deps,
       config: {
         ...deps.config,
-        sttConfig: {
-          ...deps.config.sttConfig,
-          ...(config.prompt ? { prompt: config.prompt } : {}),
-        },
+        // Shared unless overridden, so connectStt can reuse its cached URL.
+        sttConfig: config.prompt
+          ? { ...deps.config.sttConfig, prompt: config.prompt }
+          : deps.config.sttConfig,
         ttsConfig: {
           ...deps.config.ttsConfig,
           ...(config.voice ? { voice: config.voice } : {}),
         },
       },
     };
+    this.greeting = config.greeting ?? DEFAULT_GREETING;
     this.toolSchemas = toolSchemas;
+    // Dispatch by name: user tools skip the builtin lookup entirely.
+    this.executeBuiltinTool = enabledBuiltinTools(
+      config,
+      (name, args, signal) => deps.executeBuiltinTool(name, args, signal),
+    );
 
-    const agentInstructions = this.agentConfig.instructions
-      ? `\n\nAgent-Specific Instructions:\n${this.agentConfig.instructions}`
-      : "";
-    const toolReminder = this.toolSchemas.length > 0
-      ? "\n\nAnswer the user's request using relevant tools (if they are available). " +
-        "Before calling a tool, do some analysis. " +
-        "First, think about which of the provided tools is the relevant tool to answer the user's request. " +
-        "Second, go through each of the required parameters of the relevant tool and determine if the user has directly provided or given enough information to infer a value. " +
-        "When deciding if the parameter can be inferred, carefully consider all the context to see if it supports a specific value. " +
-        "If all of the required parameters are present or can be reasonably inferred, proceed with the tool call. " +
-        "BUT, if one of the values for a required parameter is missing, DO NOT invoke the function (not even with fillers for the missing params) and instead, ask the user to provide the missing parameters. " +
-        "DO NOT ask for more information on optional parameters if it is not provided. " +
-        "Do not answer from memory alone when a tool can provide accurate, up-to-date information." +
-        "\n\nIMPORTANT: You MUST call the final_answer tool to deliver every response. " +
-        "Put your complete spoken response in the answer parameter. " +
-        "It is the only way to complete the task — otherwise you will be stuck in a loop."
-      : "";
     this.messages.push({
       role: "system",
-      content: DEFAULT_INSTRUCTIONS + agentInstructions + toolReminder +
-        VOICE_RULES,
+      content: buildSystemPrompt(config, toolSchemas.length > 0),
     });
   }
 
   private trySendJson(data: Record<string, unknown>): void {
+    this.trySendText(JSON.stringify(data));
+  }
+
+  private trySendText(frame: string): void {
     try {
       if (this.browserWs.readyState === 1) {
-        this.browserWs.send(JSON.stringify(data));
+        this.browserWs.send(frame);
       }
     } catch (err) {
-      this.logger.error("trySendJson failed", { err });
+      this.logger.error("trySendText failed", { err });
     }
   }
 
@@ -150,8 +210,7 @@ export class ServerSession {
       ttsSampleRate: this.deps.config.ttsConfig.sampleRate,
     });
 
-    const greeting = this.agentConfig.greeting ?? DEFAULT_GREETING;
-    if (greeting) this.pendingGreeting = greeting;
+    this.greetingPending = this.greeting !== "";
 
     this.connectStt().catch((err) => {
       this.logger.error("Unhandled error in connectStt", { err });
@@ -200,10 +259,9 @@ export class ServerSession {
   }
 
   onAudioReady(): void {
-    if (this.pendingGreeting) {
-      this.trySendJson({ type: "greeting", text: this.pendingGreeting });
-      this.ttsRelay(this.pendingGreeting);
-      this.pendingGreeting = null;
+    if (this.greetingPending) {
+      this.greetingPending = false;
+      this.sendGreeting();
     }
   }
 
@@ -224,9 +282,9 @@ export class ServerSession {
     this.stt?.clear();
     if (pending) {
       // Wait for TTS to finish aborting so no audio chunks arrive after "cancelled".
-      pending.then(() => this.trySendJson({ type: "cancelled" }));
+      pending.then(() => this.trySendText(FRAME.cancelled));
     } else {
-      this.trySendJson({ type: "cancelled" });
+      this.trySendText(FRAME.cancelled);
     }
   }
 
@@ -234,13 +292,15 @@ export class ServerSession {
     this.cancelInflight();
     this.stt?.clear();
     this.messages = this.messages.slice(0, 1);
-    this.trySendJson({ type: "reset" });
+    this.trySendText(FRAME.reset);
 
-    const greeting = this.agentConfig.greeting ?? DEFAULT_GREETING;
-    if (greeting) {
-      this.trySendJson({ type: "greeting", text: greeting });
-      this.ttsRelay(greeting);
-    }
+    this.sendGreeting();
+  }
+
+  private sendGreeting(): void {
+    if (!this.greeting) return;
+    this.trySendJson({ type: "greeting", text: this.greeting });
+    this.ttsRelay(this.greeting, true);
   }
 
   async stop(): Promise<void> {
@@ -265,57 +325,122 @@ export class ServerSession {
     this.cancelInflight();
 
     this.trySendJson({ type: "turn", text });
-    this.trySendJson({ type: "thinking" });
+    this.trySendText(FRAME.thinking);
 
     const abort = new AbortController();
     this.chatAbort = abort;
 
+    // Replace a TTS connection the server dropped while idle now, so the
+    // handshake overlaps the LLM call instead of delaying the first audio.
+    this.deps.ttsClient.prewarm();
+
+    // Keep per-turn prompt size bounded in long conversations.
+    trimHistory(this.messages, MAX_HISTORY_TURNS - 1, MAX_HISTORY_TURNS / 2);
+
+    // Opening turns depend only on the system prompt, so they can be served
+    // from the agent-wide cache without an LLM round-trip.
+    const cache = this.messages.length === 1
+      ? this.deps.responseCache
+      : undefined;
+    // Sentences streamed from the LLM start TTS before the turn completes.
+    let speech = null as TextQueue | null;
+
     try {
+      const cached = cache?.get(text);
+      if (cached) {
+        this.logger.info("turn served from response cache");
+        this.messages.push(
+          { role: "user", content: text },
+          { role: "assistant", content: cached.text },
+        );
+        // Cached answers recur, so their audio is worth caching too.
+        this.sendTurnResult(cached, { cacheable: true });
+        return;
+      }
+
       const ctx: TurnContext = {
         messages: this.messages,
         toolSchemas: this.toolSchemas,
         logger: this.logger,
         callLLM: (opts) => this.deps.callLLM(opts),
-        executeBuiltinTool: (name, args) =>
-          this.deps.executeBuiltinTool(name, args),
+        executeBuiltinTool: this.executeBuiltinTool,
         executeUserTool: this.deps.executeTool,
         apiKey: this.deps.config.apiKey,
         model: this.deps.config.model,
         gatewayBase: this.deps.config.llmGatewayBase,
+        onStep: (step) => this.trySendJson({ type: "step", step }),
+        onSentence: (sentence) => {
+          if (abort.signal.aborted) return;
+          if (!speech) {
+            const queue = speech = new TextQueue(MAX_PENDING_SENTENCES);
+            // A stream held back by a full queue must resume when the turn
+            // is cancelled, or TTS stops reading the queue.
+            abort.signal.addEventListener("abort", () => queue.close(), {
+              once: true,
+            });
+            this.ttsRelay(queue);
+          }
+          return speech.push(sentence);
+        },
       };
 
       const result = await executeTurn(text, ctx, abort.signal);
-
-      this.trySendJson({
-        type: "chat",
-        text: result.text,
-        steps: result.steps,
-      });
-
-      if (result.text) {
-        this.ttsRelay(result.text);
-      } else {
-        this.trySendJson({ type: "tts_done" });
-      }
+      if (cache && !abort.signal.aborted) cache.set(text, result);
+      this.sendTurnResult(result, { speaking: speech !== null });
     } catch (err) {
       if (abort.signal.aborted) return;
       const msg = err instanceof Error ? err.message : String(err);
       this.logger.error("Chat failed", { error: msg });
       this.trySendJson({ type: "error", message: ERR.CHAT_FAILED });
     } finally {
+      speech?.close();
       if (this.chatAbort === abort) this.chatAbort = null;
     }
   }
 
-  private ttsRelay(text: string): void {
+  private sendTurnResult(
+    result: TurnResult,
+    opts: { speaking?: boolean; cacheable?: boolean } = {},
+  ): void {
+    this.trySendJson({
+      type: "chat",
+      text: result.text,
+      steps: result.steps,
+    });
+
+    if (opts.speaking) return;
+    if (result.text) {
+      this.ttsRelay(result.text, opts.cacheable);
+    } else {
+      this.trySendText(FRAME.ttsDone);
+    }
+  }
+
+  /**
+   * Speaks `text` to the browser. With `cacheable`, fixed utterances are
+   * replayed from the agent's audio cache instead of being re-synthesized.
+   */
+  private ttsRelay(text: TtsText, cacheable = false): void {
     const abort = new AbortController();
     this.ttsAbort = abort;
 
-    const promise = this.deps.ttsClient
-      .synthesize(text, (chunk) => this.trySendBytes(chunk), abort.signal)
+    const cache = cacheable && typeof text === "string"
+      ? this.deps.audioCache
+      : undefined;
+    // Another session may be synthesizing the same utterance right now; let
+    // it land in the cache rather than synthesizing it a second time.
+    const inflight = cache?.pending(
+      this.deps.config.ttsConfig.voice,
+      text as string,
+    );
+    const synthesis = inflight
+      ? inflight.then(() => this.speak(text, abort.signal, cache))
+      : this.speak(text, abort.signal, cache);
+
+    const promise = synthesis
       .then(() => {
         if (!abort.signal.aborted) {
-          this.trySendJson({ type: "tts_done" });
+          this.trySendText(FRAME.ttsDone);
         }
       })
       .catch((err) => {
@@ -325,12 +450,60 @@ export class ServerSession {
         }
       })
       .finally(() => {
+        // Synthesis can end without draining streamed text (failed to
+        // connect, aborted before opening); closing the queue releases a
+        // producer waiting for room in it.
+        if (text instanceof TextQueue) text.close();
         if (this.ttsAbort === abort) this.ttsAbort = null;
         if (this.ttsPromise === promise) this.ttsPromise = null;
       });
     this.ttsPromise = promise;
   }
 
+  /** Replays `text` from `cache` when present, else synthesizes it. */
+  private speak(
+    text: TtsText,
+    signal: AbortSignal,
+    cache?: AudioCache,
+  ): Promise<void> {
+    if (signal.aborted) return Promise.resolve();
+    if (!cache || typeof text !== "string") {
+      // Streamed speech starts before "chat" (which otherwise moves the
+      // client to speaking), so announce it with the first audio frame.
+      let announced = typeof text === "string";
+      return this.deps.ttsClient.synthesize(
+        text,
+        (chunk) => {
+          if (!announced) {
+            announced = true;
+            this.trySendText(FRAME.speaking);
+          }
+          this.trySendBytes(chunk);
+        },
+        signal,
+      );
+    }
+
+    const voice = this.deps.config.ttsConfig.voice;
+    const cached = cache.get(voice, text);
+    if (cached) {
+      for (const chunk of cached) this.trySendBytes(chunk);
+      return Promise.resolve();
+    }
+
+    const chunks: Uint8Array[] = [];
+    const synthesis = this.deps.ttsClient
+      .synthesize(text, (chunk) => {
+        this.trySendBytes(chunk);
+        chunks.push(chunk);
+      }, signal)
+      .then(() => {
+        if (!signal.aborted) cache.set(voice, text, coalesceFrames(chunks));
+      });
+    cache.track(voice, text, synthesis);
+    return synthesis;
+  }
+
   static create(
     sessionId: string,
     ws: SessionTransport,
@@ -340,17 +513,21 @@ export class ServerSession {
   ): ServerSession {
     const secrets = opts.secrets ?? {};
     const deps: SessionDeps = {
-      config: {
-        ...opts.platformConfig,
-        ttsConfig: { ...opts.platformConfig.ttsConfig },
-      },
+      // The constructor derives its own per-session config; no copy needed.
+      config: opts.platformConfig,
       connectStt: opts.depsOverride?.connectStt ?? defaultConnectStt,
       callLLM: opts.depsOverride?.callLLM ?? defaultCallLLM,
       ttsClient: opts.depsOverride?.ttsClient ??
         new TtsClient(opts.platformConfig.ttsConfig),
       executeTool: opts.depsOverride?.executeTool ?? opts.executeTool,
+      // Loaded on first use: most sessions never call a builtin tool.
       executeBuiltinTool: opts.depsOverride?.executeBuiltinTool ??
-        ((name, args) => defaultExecuteBuiltinTool(name, args, secrets)),
+        (async (name, args, signal) => {
+          const { executeBuiltinTool } = await import("./builtin_tools.ts");
+          return executeBuiltinTool(name, args, secrets, signal);
+        }),
+      responseCache: opts.depsOverride?.responseCache ?? opts.responseCache,
+      audioCache: opts.depsOverride?.audioCache ?? opts.audioCache,
     };
     return new ServerSession(sessionId, ws, agentConfig, toolSchemas, deps);
   }
@@ -360,5 +537,7 @@ export interface CreateSessionOptions {
   platformConfig: PlatformConfig;
   executeTool: ExecuteTool;
   secrets?: Record<string, string | undefined>;
+  responseCache?: ResponseCache;
+  audioCache?: AudioCache;
   depsOverride?: Partial<SessionDeps>;
 }
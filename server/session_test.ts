@@ -1,6 +1,6 @@
 import { describe, it } from "@std/testing/bdd";
 import { expect } from "@std/expect";
-import { ServerSession } from "./session.ts";
+import { buildSystemPrompt, ServerSession } from "./session.ts";
 import type { AgentConfig } from "./types.ts";
 import {
   createMockLLMResponse,
@@ -9,6 +9,9 @@ import {
   getSentJson,
 } from "./_test_utils.ts";
 import type { SttEvents } from "./stt.ts";
+import { ResponseCache } from "./response_cache.ts";
+import { AudioCache } from "./audio_cache.ts";
+import type { TtsText } from "./tts.ts";
 
 function createSession(
   overrides?: Parameters<typeof createMockSessionDeps>[0],
@@ -100,6 +103,63 @@ describe("ServerSession", () => {
       expect(ttsClient.synthesizeCalls.length).toBeGreaterThan(0);
     });
 
+    it("replays the greeting from the agent audio cache", async () => {
+      const audioCache = new AudioCache();
+      let synthesized = 0;
+      const ttsClient = {
+        synthesize(_text: TtsText, onAudio: (chunk: Uint8Array) => void) {
+          synthesized++;
+          onAudio(new Uint8Array([1, 2, 3]));
+          return Promise.resolve();
+        },
+        prewarm() {},
+        close() {},
+      };
+
+      const first = createSession({ audioCache, ttsClient });
+      first.session.start();
+      first.session.onAudioReady();
+      await new Promise((r) => setTimeout(r, 10));
+
+      const second = createSession({ audioCache, ttsClient });
+      second.session.start();
+      second.session.onAudioReady();
+      await new Promise((r) => setTimeout(r, 10));
+
+      expect(synthesized).toBe(1);
+      expect(second.transport.sent).toContainEqual(new Uint8Array([1, 2, 3]));
+      expect(getSentJson(second.transport).find((m) => m.type === "tts_done"))
+        .toBeDefined();
+    });
+
+    it("shares one greeting synthesis between concurrent sessions", async () => {
+      const audioCache = new AudioCache();
+      let synthesized = 0;
+      const ttsClient = {
+        async synthesize(
+          _text: TtsText,
+          onAudio: (chunk: Uint8Array) => void,
+        ) {
+          synthesized++;
+          await new Promise((r) => setTimeout(r, 5));
+          onAudio(new Uint8Array([7, 8]));
+        },
+        prewarm() {},
+        close() {},
+      };
+
+      const first = createSession({ audioCache, ttsClient });
+      const second = createSession({ audioCache, ttsClient });
+      first.session.start();
+      second.session.start();
+      first.session.onAudioReady();
+      second.session.onAudioReady();
+      await new Promise((r) => setTimeout(r, 20));
+
+      expect(synthesized).toBe(1);
+      expect(second.transport.sent).toContainEqual(new Uint8Array([7, 8]));
+    });
+
     it("is a no-op on second call", async () => {
       const { session, ttsClient } = createSession();
       session.start();
@@ -178,6 +238,7 @@ describe("ServerSession", () => {
       );
       expect(ctx.llmCalls.length).toBe(1);
       expect(ctx.ttsClient.synthesizeCalls.length).toBeGreaterThan(0);
+      expect(ctx.ttsClient.prewarmCalls).toBe(1);
     });
 
     it("handles tool calls", async () => {
@@ -206,6 +267,39 @@ describe("ServerSession", () => {
         .toBe("It's sunny in NYC.");
     });
 
+    it("routes only enabled builtin tools to the builtin executor", async () => {
+      const builtinCalls: string[] = [];
+      let callIdx = 0;
+      const ctx = createSessionWithSttEvents(
+        {
+          callLLM: () =>
+            Promise.resolve(
+              [
+                createMockLLMResponse(null, [
+                  { id: "c1", name: "web_search", arguments: "{}" },
+                  { id: "c2", name: "visit_webpage", arguments: "{}" },
+                ]),
+              ][callIdx++] ?? createMockLLMResponse("Done."),
+            ),
+          executeBuiltinTool: (name) => {
+            builtinCalls.push(name);
+            return Promise.resolve("builtin result");
+          },
+        },
+        { builtinTools: ["web_search"] },
+      );
+
+      ctx.session.start();
+      await new Promise((r) => setTimeout(r, 10));
+      ctx.events.current!.onTurn("Search");
+      await ctx.session.turnPromise;
+
+      expect(builtinCalls).toEqual(["web_search"]);
+      expect(ctx.executeTool.calls.map((c) => c.name)).toEqual([
+        "visit_webpage",
+      ]);
+    });
+
     it("sends ERROR on LLM failure", async () => {
       const ctx = createSessionWithSttEvents({
         callLLM: () => {
@@ -238,6 +332,146 @@ describe("ServerSession", () => {
         .toBeDefined();
     });
 
+    it("serves repeated opening turns from the response cache", async () => {
+      const responseCache = new ResponseCache();
+      const first = createSessionWithSttEvents({ responseCache });
+      first.session.start();
+      await new Promise((r) => setTimeout(r, 10));
+      first.events.current!.onTurn("Hello there");
+      await first.session.turnPromise;
+      expect(first.llmCalls.length).toBe(1);
+
+      const second = createSessionWithSttEvents({ responseCache });
+      second.session.start();
+      await new Promise((r) => setTimeout(r, 10));
+      second.events.current!.onTurn("hello there!");
+      await second.session.turnPromise;
+
+      expect(second.llmCalls.length).toBe(0);
+      const chat = getSentJson(second.transport).find((m) => m.type === "chat");
+      expect(chat!.text).toBe("Hello from LLM");
+      expect(second.ttsClient.synthesizeCalls.length).toBeGreaterThan(0);
+    });
+
+    it("replays audio for repeated response-cache hits", async () => {
+      const responseCache = new ResponseCache();
+      const audioCache = new AudioCache();
+      let synthesized = 0;
+      const ttsClient = {
+        synthesize(_text: TtsText, onAudio: (chunk: Uint8Array) => void) {
+          synthesized++;
+          onAudio(new Uint8Array([4, 5, 6]));
+          return Promise.resolve();
+        },
+        prewarm() {},
+        close() {},
+      };
+
+      for (let i = 0; i < 3; i++) {
+        const ctx = createSessionWithSttEvents({
+          responseCache,
+          audioCache,
+          ttsClient,
+        });
+        ctx.session.start();
+        await new Promise((r) => setTimeout(r, 10));
+        ctx.events.current!.onTurn("Hello there");
+        await ctx.session.turnPromise;
+        await new Promise((r) => setTimeout(r, 10));
+      }
+
+      // Fresh answer, then the first cache hit records its audio, then the
+      // second cache hit replays it.
+      expect(synthesized).toBe(2);
+    });
+
+    it("starts TTS with streamed sentences before the turn ends", async () => {
+      const ctx = createSessionWithSttEvents({
+        callLLM: (opts) => {
+          opts.onText?.("First sentence. ");
+          opts.onText?.("Second one.");
+          return Promise.resolve(
+            createMockLLMResponse("First sentence. Second one."),
+          );
+        },
+      });
+      ctx.session.start();
+      await new Promise((r) => setTimeout(r, 10));
+
+      ctx.events.current!.onTurn("Talk to me");
+      await ctx.session.turnPromise;
+      await new Promise((r) => setTimeout(r, 10));
+
+      expect(ctx.ttsClient.synthesizeCalls).toEqual([
+        { text: "First sentence. Second one." },
+      ]);
+      const messages = getSentJson(ctx.transport);
+      expect(messages.find((m) => m.type === "chat")!.text).toBe(
+        "First sentence. Second one.",
+      );
+      expect(messages.find((m) => m.type === "tts_done")).toBeDefined();
+    });
+
+    it("announces streamed speech with its first audio frame", async () => {
+      const ctx = createSessionWithSttEvents({
+        ttsClient: {
+          async synthesize(text: TtsText, onAudio: (c: Uint8Array) => void) {
+            for await (const _ of text as AsyncIterable<string>) {
+              onAudio(new Uint8Array([1]));
+              onAudio(new Uint8Array([2]));
+            }
+          },
+          prewarm() {},
+          close() {},
+        },
+        callLLM: async (opts) => {
+          await opts.onText?.("First sentence. ");
+          // Let the first audio go out while the LLM is still "generating".
+          await new Promise((r) => setTimeout(r, 5));
+          return createMockLLMResponse("First sentence.");
+        },
+      });
+      ctx.session.start();
+      await new Promise((r) => setTimeout(r, 10));
+
+      ctx.events.current!.onTurn("Talk to me");
+      await ctx.session.turnPromise;
+      await new Promise((r) => setTimeout(r, 10));
+
+      const types = getSentJson(ctx.transport).map((m) => m.type);
+      expect(types.filter((t) => t === "speaking")).toHaveLength(1);
+      expect(types.indexOf("speaking")).toBeLessThan(types.indexOf("chat"));
+    });
+
+    it("finishes the turn when TTS fails before reading the sentences", async () => {
+      const ctx = createSessionWithSttEvents({
+        ttsClient: {
+          synthesize: () => Promise.reject(new Error("connect failed")),
+          prewarm() {},
+          close() {},
+        },
+        callLLM: async (opts) => {
+          // Like the real stream reader, wait on each push (backpressure).
+          for (let i = 1; i <= 8; i++) {
+            await opts.onText?.(`Sentence number ${i}. `);
+          }
+          return createMockLLMResponse("Eight sentences.");
+        },
+      });
+      ctx.session.start();
+      await new Promise((r) => setTimeout(r, 10));
+
+      ctx.events.current!.onTurn("Talk to me");
+      await ctx.session.turnPromise;
+      await new Promise((r) => setTimeout(r, 10));
+
+      const messages = getSentJson(ctx.transport);
+      expect(messages.find((m) => m.type === "chat")!.text).toBe(
+        "Eight sentences.",
+      );
+      expect(messages.find((m) => m.type === "error")).toBeDefined();
+    });
+
     it("relays STT transcript to browser", async () => {
       const ctx = createSessionWithSttEvents();
       ctx.session.start();
@@ -297,3 +531,18 @@ describe("ServerSession", () => {
     });
   });
 });
+
+describe("buildSystemPrompt", () => {
+  const config = { instructions: "Be a pirate.", greeting: "", voice: "" };
+
+  it("includes agent instructions", () => {
+    expect(buildSystemPrompt(config, false)).toContain(
+      "Agent-Specific Instructions:\nBe a pirate.",
+    );
+  });
+
+  it("adds the final_answer reminder only when tools exist", () => {
+    expect(buildSystemPrompt(config, false)).not.toContain("final_answer");
+    expect(buildSystemPrompt(config, true)).toContain("final_answer");
+  });
+});
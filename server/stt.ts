@@ -19,25 +19,37 @@ export interface SttHandle {
   close: () => void;
 }
 
+// Connection URLs depend only on the (never mutated) config object, which
+// is shared by sessions without a prompt override and reused on reconnect.
+const sttUrls = new WeakMap<STTConfig, string>();
+
+function sttUrl(config: STTConfig): string {
+  let url = sttUrls.get(config);
+  if (url === undefined) {
+    const params = new URLSearchParams({
+      sample_rate: String(config.sampleRate),
+      speech_model: config.speechModel,
+      format_turns: String(config.formatTurns),
+      min_end_of_turn_silence_when_confident: String(
+        config.minEndOfTurnSilenceWhenConfident,
+      ),
+      max_turn_silence: String(config.maxTurnSilence),
+    });
+    if (config.prompt) {
+      params.set("prompt", config.prompt);
+    }
+    url = `${config.wssBase}?${params}`;
+    sttUrls.set(config, url);
+  }
+  return url;
+}
+
 export async function connectStt(
   apiKey: string,
   config: STTConfig,
   events: SttEvents,
 ): Promise<SttHandle> {
-  const params = new URLSearchParams({
-    sample_rate: String(config.sampleRate),
-    speech_model: config.speechModel,
-    format_turns: String(config.formatTurns),
-    min_end_of_turn_silence_when_confident: String(
-      config.minEndOfTurnSilenceWhenConfident,
-    ),
-    max_turn_silence: String(config.maxTurnSilence),
-  });
-  if (config.prompt) {
-    params.set("prompt", config.prompt);
-  }
-
-  const url = `${config.wssBase}?${params}`;
+  const url = sttUrl(config);
   const wsOpts = { headers: { Authorization: apiKey } };
 
   // deno-lint-ignore no-explicit-any
@@ -0,0 +1,68 @@
+/**
+ * Single-producer, single-consumer async queue of text chunks. The producer
+ * pushes chunks as they become available and closes the queue when it is
+ * done; the consumer iterates with `for await`.
+ *
+ * `push` always enqueues, but once `maxSize` chunks are waiting the promise
+ * it returns stays pending until the consumer catches up, so a producer
+ * that awaits it is held back instead of racing ahead.
+ */
+export class TextQueue implements AsyncIterable<string> {
+  private items: string[] = [];
+  private closed = false;
+  private maxSize: number;
+  private wake: (() => void) | null = null;
+  private waiting: (() => void)[] = [];
+
+  constructor(maxSize = Infinity) {
+    this.maxSize = maxSize;
+  }
+
+  push(text: string): Promise<void> {
+    if (this.closed) return Promise.resolve();
+    this.items.push(text);
+    this.notify();
+    if (this.items.length < this.maxSize) return Promise.resolve();
+    return new Promise((resolve) => this.waiting.push(resolve));
+  }
+
+  close(): void {
+    this.closed = true;
+    this.notify();
+    this.release();
+  }
+
+  private notify(): void {
+    this.wake?.();
+    this.wake = null;
+  }
+
+  /** Resolves every push still waiting for room, not just the latest. */
+  private release(): void {
+    const waiting = this.waiting;
+    this.waiting = [];
+    for (const resolve of waiting) resolve();
+  }
+
+  async *[Symbol.asyncIterator](): AsyncIterator<string> {
+    try {
+      while (true) {
+        const next = this.items.shift();
+        if (next !== undefined) {
+          if (this.items.length < this.maxSize) this.release();
+          yield next;
+        } else if (this.closed) {
+          return;
+        } else {
+          await new Promise<void>((resolve) => this.wake = resolve);
+        }
+      }
+    } finally {
+      // The consumer stopped (done, broke out, or threw): never leave the
+      // producer waiting for space that will not come.
+      this.closed = true;
+      this.items.length = 0;
+      this.release();
+    }
+  }
+}
@@ -0,0 +1,66 @@
+import { describe, it } from "@std/testing/bdd";
+import { expect } from "@std/expect";
+import { TextQueue } from "./text_queue.ts";
+
+describe("TextQueue", () => {
+  it("yields pushed chunks in order until closed", async () => {
+    const queue = new TextQueue();
+    queue.push("a");
+    const seen: string[] = [];
+    const done = (async () => {
+      for await (const chunk of queue) seen.push(chunk);
+    })();
+
+    await new Promise((r) => setTimeout(r, 1));
+    queue.push("b");
+    queue.close();
+    await done;
+    expect(seen).toEqual(["a", "b"]);
+  });
+
+  it("ignores pushes after close", async () => {
+    const queue = new TextQueue();
+    queue.close();
+    queue.push("late");
+    const seen: string[] = [];
+    for await (const chunk of queue) seen.push(chunk);
+    expect(seen).toEqual([]);
+  });
+
+  it("holds the producer back once maxSize chunks are waiting", async () => {
+    const queue = new TextQueue(2);
+    let released = false;
+    await queue.push("a");
+    queue.push("b").then(() => released = true);
+    await new Promise((r) => setTimeout(r, 1));
+    expect(released).toBe(false);
+
+    const iter = queue[Symbol.asyncIterator]();
+    expect((await iter.next()).value).toBe("a");
+    await new Promise((r) => setTimeout(r, 1));
+    expect(released).toBe(true);
+  });
+
+  it("releases a waiting producer when the consumer stops", async () => {
+    const queue = new TextQueue(1);
+    const waiting = queue.push("a");
+    for await (const _ of queue) break;
+    await waiting;
+    await queue.push("b");
+  });
+
+  it("releases every waiting push, not just the latest", async () => {
+    const queue = new TextQueue(2);
+    // Several sentences from one network chunk, pushed without awaiting.
+    const waits = ["a", "b", "c", "d"].map((t) => queue.push(t));
+    const seen: string[] = [];
+    const done = (async () => {
+      for await (const chunk of queue) seen.push(chunk);
+    })();
+
+    await Promise.all(waits);
+    queue.close();
+    await done;
+    expect(seen).toEqual(["a", "b", "c", "d"]);
+  });
+});
@@ -11,22 +11,41 @@ function safeClose(ws: WebSocket): void {
   }
 }
 
+/** Text to speak, either complete or as chunks that are still arriving. */
+export type TtsText = string | AsyncIterable<string>;
+
+function splitWords(text: string): string[] {
+  return text.split(/\s+/).filter(Boolean);
+}
+
 export interface ITtsClient {
   synthesize(
-    text: string,
+    text: TtsText,
     onAudio: (chunk: Uint8Array) => void,
     signal?: AbortSignal,
   ): Promise<void>;
+  /** Makes sure a connection is ready for the next `synthesize`. */
+  prewarm(): void;
   close(): void;
 }
 
 export class TtsClient {
   private config: TTSConfig;
+  /** Opening frame of every utterance; fixed for the client's lifetime. */
+  private configFrame: string;
   private warmWs: WebSocket | null = null;
   private disposed = false;
 
   constructor(config: TTSConfig) {
     this.config = config;
+    this.configFrame = JSON.stringify({
+      voice: config.voice,
+      max_tokens: config.maxTokens,
+      buffer_size: config.bufferSize,
+      repetition_penalty: config.repetitionPenalty,
+      temperature: config.temperature,
+      top_p: config.topP,
+    });
     this.warmUp();
   }
 
@@ -64,8 +83,13 @@ export class TtsClient {
     this.warmWs = ws;
   }
 
+  prewarm(): void {
+    if (this.warmWs && this.warmWs.readyState <= WebSocket.OPEN) return;
+    this.warmUp();
+  }
+
   synthesize(
-    text: string,
+    text: TtsText,
     onAudio: (chunk: Uint8Array) => void,
     signal?: AbortSignal,
   ): Promise<void> {
@@ -74,11 +98,15 @@ export class TtsClient {
       return Promise.resolve();
     }
 
-    log.info("synthesize start", {
-      textLength: text.length,
-      text: text.length > 200 ? text.slice(0, 200) + "…" : text,
-      voice: this.config.voice,
-    });
+    if (typeof text === "string") {
+      log.info("synthesize start", {
+        textLength: text.length,
+        text: text.length > 200 ? text.slice(0, 200) + "…" : text,
+        voice: this.config.voice,
+      });
+    } else {
+      log.info("synthesize start (streaming)", { voice: this.config.voice });
+    }
 
     let ws: WebSocket;
     if (this.warmWs && this.warmWs.readyState <= WebSocket.OPEN) {
@@ -107,7 +135,7 @@ export class TtsClient {
 
   private runTtsProtocol(
     ws: WebSocket,
-    text: string,
+    text: TtsText,
     onAudio: (chunk: Uint8Array) => void,
     signal?: AbortSignal,
   ): Promise<void> {
@@ -125,30 +153,40 @@ export class TtsClient {
 
       signal?.addEventListener("abort", onAbort, { once: true });
 
-      const sendText = () => {
-        log.info("TTS sending text to WebSocket", {
-          wordCount: text.split(/\s+/).filter(Boolean).length,
-        });
-        ws.send(
-          JSON.stringify({
-            voice: this.config.voice,
-            max_tokens: this.config.maxTokens,
-            buffer_size: this.config.bufferSize,
-            repetition_penalty: this.config.repetitionPenalty,
-            temperature: this.config.temperature,
-            top_p: this.config.topP,
-          }),
-        );
-        for (const word of text.split(/\s+/)) {
-          if (word) ws.send(word);
+      // The TTS protocol takes one word per frame, so the words themselves
+      // cannot be batched; each text is split only once, though.
+      const sendWords = (words: string[]) => {
+        for (const word of words) ws.send(word);
+      };
+
+      const sendText = async () => {
+        ws.send(this.configFrame);
+        if (typeof text === "string") {
+          const words = splitWords(text);
+          log.info("TTS sending text to WebSocket", {
+            wordCount: words.length,
+          });
+          sendWords(words);
+        } else {
+          for await (const chunk of text) {
+            if (signal?.aborted || ws.readyState !== WebSocket.OPEN) return;
+            sendWords(splitWords(chunk));
+          }
         }
-        ws.send("__END__");
+        if (ws.readyState === WebSocket.OPEN) ws.send("__END__");
+      };
+
+      const startSending = () => {
+        sendText().catch((err) => {
+          log.error("TTS failed to send text", { error: err });
+          cleanup();
+        });
       };
 
       if (ws.readyState === WebSocket.OPEN) {
-        sendText();
+        startSending();
       } else {
-        ws.onopen = sendText;
+        ws.onopen = startSending;
       }
 
       ws.onmessage = (event) => {
@@ -119,6 +119,16 @@ describe("TtsClient", () => {
     expect(mockWs.created.length).toBeGreaterThanOrEqual(2);
   });
 
+  it("prewarm replaces a closed warm WS and keeps a live one", () => {
+    const client = new TtsClient(config);
+    client.prewarm();
+    expect(mockWs.created.length).toBe(1);
+
+    mockWs.created[0].readyState = MockWebSocket.CLOSED;
+    client.prewarm();
+    expect(mockWs.created.length).toBe(2);
+  });
+
   it("close disposes warm WS", () => {
     const client = new TtsClient(config);
     client.close();
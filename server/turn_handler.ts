@@ -1,11 +1,44 @@
+import { pooledMap } from "@std/async/pool";
 import type { Logger } from "../_utils/logger.ts";
 import type { CallLLMOptions } from "./llm.ts";
 import type { ChatMessage, LLMResponse, ToolSchema } from "./types.ts";
 
-const FINAL_ANSWER_TOOL = "final_answer";
+export const FINAL_ANSWER_TOOL = "final_answer";
+export const FINAL_ANSWER_STEP = `Using ${FINAL_ANSWER_TOOL}`;
 
 const MAX_TOOL_ITERATIONS = 3;
 
+const DEFAULT_BATCH_CONCURRENCY = 8;
+
+const SENTENCE_BOUNDARY = /[.!?]["')\]]*\s/g;
+const CLAUSE_BOUNDARY = /[,;:]\s/g;
+
+// Streamed text that runs on without a sentence break is released at a
+// clause or word boundary once this many characters are waiting. The limit
+// starts small so audio begins quickly and doubles with each release, since
+// later chunks only need to stay ahead of playback.
+const FIRST_CHUNK_CHARS = 40;
+const MAX_CHUNK_CHARS = 320;
+
+const FORCE_FINAL_ANSWER = {
+  type: "function",
+  function: { name: FINAL_ANSWER_TOOL },
+} as const;
+
+// A session's schema list never changes, so the single-tool list used to
+// force final_answer is built once per list rather than on every turn.
+const finalAnswerTools = new WeakMap<ToolSchema[], ToolSchema[] | null>();
+
+function finalAnswerToolsFor(toolSchemas: ToolSchema[]): ToolSchema[] | null {
+  let tools = finalAnswerTools.get(toolSchemas);
+  if (tools === undefined) {
+    const schema = toolSchemas.find((t) => t.name === FINAL_ANSWER_TOOL);
+    tools = schema ? [schema] : null;
+    finalAnswerTools.set(toolSchemas, tools);
+  }
+  return tools;
+}
+
 export interface TurnContext {
   messages: ChatMessage[];
   toolSchemas: ToolSchema[];
@@ -14,6 +47,7 @@ export interface TurnContext {
   executeBuiltinTool(
     name: string,
     args: Record<string, unknown>,
+    signal?: AbortSignal,
   ): Promise<string | null>;
   executeUserTool(
     name: string,
@@ -22,6 +56,13 @@ export interface TurnContext {
   apiKey: string;
   model: string;
   gatewayBase?: string;
+  /**
+   * Receives the answer sentence by sentence while the LLM is streaming.
+   * Returning a promise holds the stream back until it settles.
+   */
+  onSentence?(text: string): void | Promise<void>;
+  /** Receives each step as soon as it is taken, e.g. "Using web_search". */
+  onStep?(step: string): void;
 }
 
 export interface TurnResult {
@@ -50,6 +91,10 @@ function formatMessages(messages: ChatMessage[]): string[] {
   });
 }
 
+// How many messages of each conversation have already been dumped, so each
+// request only logs what is new instead of replaying the whole history.
+const loggedCounts = new WeakMap<ChatMessage[], number>();
+
 function logLlmRequest(
   logger: Logger,
   label: string,
@@ -57,14 +102,20 @@ function logLlmRequest(
   toolChoice?: string,
   toolCount?: number,
 ): void {
+  const from = Math.min(loggedCounts.get(messages) ?? 0, messages.length);
   logger.info(`── ${label} ──`, {
     toolChoice: toolChoice ?? "auto",
     tools: toolCount ?? 0,
     messageCount: messages.length,
+    newMessages: messages.length - from,
   });
-  for (const line of formatMessages(messages)) {
-    logger.info(`  ${line}`);
+  // The per-message dump is only formatted when DEBUG logging is on.
+  if (logger.levelName === "DEBUG") {
+    for (const line of formatMessages(messages.slice(from))) {
+      logger.debug(`  ${line}`);
+    }
   }
+  loggedCounts.set(messages, messages.length);
 }
 
 function logLlmResponse(
@@ -90,6 +141,74 @@ function logLlmResponse(
   }
 }
 
+function lastBoundaryEnd(text: string, boundary: RegExp): number {
+  let end = 0;
+  for (const m of text.matchAll(boundary)) end = m.index + m[0].length;
+  return end;
+}
+
+/**
+ * Buffers streamed text and releases it at sentence boundaries, or earlier
+ * at a clause or word boundary when a sentence grows past the current chunk
+ * limit.
+ */
+class SentenceBuffer {
+  private buf = "";
+  private limit = FIRST_CHUNK_CHARS;
+  private emit: (text: string) => void | Promise<void>;
+
+  constructor(emit: (text: string) => void | Promise<void>) {
+    this.emit = emit;
+  }
+
+  push(delta: string): void | Promise<void> {
+    this.buf += delta;
+    let end = lastBoundaryEnd(this.buf, SENTENCE_BOUNDARY);
+    if (end === 0 && this.buf.length >= this.limit) {
+      end = lastBoundaryEnd(this.buf, CLAUSE_BOUNDARY) ||
+        this.buf.lastIndexOf(" ") + 1;
+    }
+    if (end === 0) return;
+    const sentence = this.buf.slice(0, end);
+    this.buf = this.buf.slice(end);
+    this.limit = Math.min(this.limit * 2, MAX_CHUNK_CHARS);
+    return this.emit(sentence);
+  }
+
+  flush(): void {
+    if (this.buf.trim()) this.emit(this.buf);
+    this.buf = "";
+  }
+}
+
+/**
+ * Once more than `maxTurns` user turns follow the system prompt, drops the
+ * oldest so `keepTurns` remain. Trimming well below the cap keeps the
+ * history prefix stable for many turns instead of shifting it every turn,
+ * which would defeat the LLM's prompt cache. Cuts only at user messages, so
+ * a tool call is never separated from its result. Mutates `messages` in
+ * place.
+ */
+export function trimHistory(
+  messages: ChatMessage[],
+  maxTurns: number,
+  keepTurns = maxTurns,
+): void {
+  const start = messages[0]?.role === "system" ? 1 : 0;
+  const userIdx: number[] = [];
+  for (let i = start; i < messages.length; i++) {
+    if (messages[i].role === "user") userIdx.push(i);
+  }
+  if (userIdx.length <= maxTurns) return;
+
+  const removed = userIdx[userIdx.length - Math.max(1, keepTurns)] - start;
+  messages.splice(start, removed);
+  const logged = loggedCounts.get(messages);
+  if (logged !== undefined) {
+    loggedCounts.set(messages, Math.max(start, logged - removed));
+  }
+}
+
 function extractFinalAnswer(msg: ChatMessage): string | null {
   const fa = msg.tool_calls?.find(
     (tc) => tc.function.name === FINAL_ANSWER_TOOL,
@@ -97,7 +216,9 @@ function extractFinalAnswer(msg: ChatMessage): string | null {
   if (!fa) return null;
   try {
     const args = JSON.parse(fa.function.arguments) as Record<string, unknown>;
-    return (args.answer as string) ?? "";
+    // Trimmed so a whitespace-only answer is treated as empty instead of
+    // being sent to TTS (and cached) as if there were something to say.
+    return String(args.answer ?? "").trim();
   } catch {
     return "";
   }
@@ -112,10 +233,16 @@ export async function executeTurn(
   messages.push({ role: "user", content: text });
 
   const toolChoice = toolSchemas.length > 0 ? "required" as const : undefined;
-  const finalAnswerSchema = toolSchemas.find(
-    (t) => t.name === FINAL_ANSWER_TOOL,
-  );
+  const finalAnswerOnly = finalAnswerToolsFor(toolSchemas);
   const steps: string[] = [];
+  const addStep = (step: string) => {
+    steps.push(step);
+    // final_answer is how the answer is delivered, not a step to show users.
+    if (step !== FINAL_ANSWER_STEP) ctx.onStep?.(step);
+  };
+  const sentences = ctx.onSentence
+    ? new SentenceBuffer(ctx.onSentence)
+    : null;
 
   function callLLM(
     tools: ToolSchema[],
@@ -129,6 +256,7 @@ export async function executeTurn(
       model: ctx.model,
       signal,
       gatewayBase: ctx.gatewayBase,
+      onText: sentences ? (delta) => sentences.push(delta) : undefined,
     });
   }
 
@@ -150,7 +278,8 @@ export async function executeTurn(
     // Check for final_answer — return immediately
     const answer = extractFinalAnswer(msg);
     if (answer !== null) {
-      steps.push("Using final_answer");
+      addStep(FINAL_ANSWER_STEP);
+      sentences?.flush();
       messages.push({ role: "assistant", content: answer });
       logger.info("turn complete (final_answer)", {
         responseLength: answer.length,
@@ -161,8 +290,8 @@ export async function executeTurn(
 
     // No more re-calls — return whatever text we have
     if (i === MAX_TOOL_ITERATIONS) {
-      const fallback = msg.content ??
-        "Sorry, I couldn't generate a response.";
+      const fallback = (msg.content ??
+        "Sorry, I couldn't generate a response.").trim();
       messages.push({ role: "assistant", content: fallback });
       return { text: fallback, steps };
     }
@@ -175,7 +304,7 @@ export async function executeTurn(
         tool_calls: msg.tool_calls,
       });
       for (const tc of msg.tool_calls) {
-        steps.push(`Using ${tc.function.name}`);
+        addStep(`Using ${tc.function.name}`);
       }
 
       logger.info("executing tools", {
@@ -203,6 +332,7 @@ export async function executeTurn(
           const builtinResult = await ctx.executeBuiltinTool(
             tc.function.name,
             args,
+            signal,
           );
           const result = builtinResult ??
             (await ctx.executeUserTool(tc.function.name, args));
@@ -240,8 +370,9 @@ export async function executeTurn(
       }
     } else {
       // Text response — shouldn't happen with toolChoice required, but handle it
-      const responseText = msg.content ??
-        "Sorry, I couldn't generate a response.";
+      const responseText = (msg.content ??
+        "Sorry, I couldn't generate a response.").trim();
+      sentences?.flush();
       messages.push({ role: "assistant", content: responseText });
       logger.info("turn complete", {
         responseLength: responseText.length,
@@ -256,7 +387,7 @@ export async function executeTurn(
     const callNum = i + 2;
     const lastIteration = i + 1 >= MAX_TOOL_ITERATIONS;
 
-    if (lastIteration && finalAnswerSchema) {
+    if (lastIteration && finalAnswerOnly) {
       logLlmRequest(
         logger,
         `LLM call #${callNum} (forced final_answer)`,
@@ -264,10 +395,7 @@ export async function executeTurn(
         FINAL_ANSWER_TOOL,
         1,
       );
-      response = await callLLM([finalAnswerSchema], {
-        type: "function" as const,
-        function: { name: FINAL_ANSWER_TOOL },
-      });
+      response = await callLLM(finalAnswerOnly, FORCE_FINAL_ANSWER);
     } else {
       logLlmRequest(
         logger,
@@ -283,3 +411,26 @@ export async function executeTurn(
 
   return { text: "", steps };
 }
+
+/**
+ * Runs independent single-turn conversations concurrently, e.g. for offline
+ * evaluation. Each turn starts from its own copy of `prefix` (typically the
+ * system prompt), so turns never see each other's history. Results are
+ * returned in input order.
+ */
+export async function executeTurns(
+  texts: string[],
+  prefix: ChatMessage[],
+  ctx: Omit<TurnContext, "messages">,
+  signal: AbortSignal,
+  concurrency = DEFAULT_BATCH_CONCURRENCY,
+): Promise<TurnResult[]> {
+  const results: TurnResult[] = [];
+  const turns = pooledMap(
+    concurrency,
+    texts,
+    (text) => executeTurn(text, { ...ctx, messages: [...prefix] }, signal),
+  );
+  for await (const result of turns) results.push(result);
+  return results;
+}
@@ -1,6 +1,11 @@
 import { describe, it } from "@std/testing/bdd";
 import { expect } from "@std/expect";
-import { executeTurn, type TurnContext } from "./turn_handler.ts";
+import {
+  executeTurn,
+  executeTurns,
+  trimHistory,
+  type TurnContext,
+} from "./turn_handler.ts";
 import { createMockLLMResponse } from "./_test_utils.ts";
 import type { ChatMessage, LLMResponse } from "./types.ts";
 import type { CallLLMOptions } from "./llm.ts";
@@ -366,6 +371,27 @@ describe("executeTurn", () => {
       expect(ctx.userToolCalls.length).toBe(0);
     });
 
+    it("trims whitespace around the final answer", async () => {
+      const ctx = createCtx({
+        callLLM: () =>
+          Promise.resolve(createMockLLMResponse(null, [
+            {
+              id: "c1",
+              name: "final_answer",
+              arguments: '{"answer":"  Sunny today.\\n"}',
+            },
+          ])),
+      });
+
+      const result = await executeTurn(
+        "Weather?",
+        ctx,
+        new AbortController().signal,
+      );
+
+      expect(result.text).toBe("Sunny today.");
+    });
+
     it("returns empty string for malformed final_answer arguments", async () => {
       const resp = createMockLLMResponse(null, [
         { id: "c1", name: "final_answer", arguments: "not json" },
@@ -385,6 +411,35 @@ describe("executeTurn", () => {
       expect(result.steps).toEqual(["Using final_answer"]);
     });
 
+    it("reports each tool step to onStep as it is taken", async () => {
+      const toolResp = createMockLLMResponse(null, [
+        { id: "c1", name: "web_search", arguments: '{"query":"weather"}' },
+      ]);
+      const finalResp = createMockLLMResponse(null, [
+        { id: "c2", name: "final_answer", arguments: '{"answer":"Sunny."}' },
+      ]);
+
+      const seen: string[] = [];
+      let idx = 0;
+      const ctx = createCtx({
+        callLLM: () => Promise.resolve([toolResp, finalResp][idx++]),
+        executeUserTool: () => {
+          expect(seen).toEqual(["Using web_search"]);
+          return Promise.resolve("72F");
+        },
+        onStep: (step) => seen.push(step),
+      });
+
+      const result = await executeTurn(
+        "Weather?",
+        ctx,
+        new AbortController().signal,
+      );
+      // final_answer is recorded in the result but never shown as a step.
+      expect(seen).toEqual(["Using web_search"]);
+      expect(result.steps).toEqual(["Using web_search", "Using final_answer"]);
+    });
+
     it("works after other tools execute first", async () => {
       const toolResp = createMockLLMResponse(null, [
         { id: "c1", name: "web_search", arguments: '{"query":"weather"}' },
@@ -416,6 +471,57 @@ describe("executeTurn", () => {
     });
   });
 
+  describe("streaming", () => {
+    it("emits streamed text to onSentence at sentence boundaries", async () => {
+      const sentences: string[] = [];
+      const ctx = createCtx({
+        callLLM: (opts) => {
+          for (const d of ["Hi the", "re. How a", "re you? Fine", " thanks"]) {
+            opts.onText?.(d);
+          }
+          return Promise.resolve(
+            createMockLLMResponse("Hi there. How are you? Fine thanks"),
+          );
+        },
+        onSentence: (s) => sentences.push(s),
+      });
+
+      const result = await executeTurn(
+        "Hi",
+        ctx,
+        new AbortController().signal,
+      );
+
+      expect(sentences).toEqual(["Hi there. ", "How are you? ", "Fine thanks"]);
+      expect(sentences.join("")).toBe(result.text);
+    });
+
+    it("releases a long opening sentence early at a clause boundary", async () => {
+      const sentences: string[] = [];
+      const text = "Well, there are quite a few things to consider here " +
+        "before we decide anything at all.";
+      const ctx = createCtx({
+        callLLM: (opts) => {
+          for (const word of text.split(/(?<= )/)) opts.onText?.(word);
+          return Promise.resolve(createMockLLMResponse(text));
+        },
+        onSentence: (s) => sentences.push(s),
+      });
+
+      await executeTurn("Hi", ctx, new AbortController().signal);
+
+      expect(sentences[0]).toBe("Well, ");
+      expect(sentences.length).toBeGreaterThan(1);
+      expect(sentences.join("")).toBe(text);
+    });
+
+    it("does not request streaming without onSentence", async () => {
+      const ctx = createCtx();
+      await executeTurn("Hi", ctx, new AbortController().signal);
+      expect(ctx.llmCalls[0].onText).toBeUndefined();
+    });
+  });
+
   describe("abort signal", () => {
     it("stops tool loop when signal is aborted mid-iteration", async () => {
       const abort = new AbortController();
@@ -453,3 +559,95 @@ describe("executeTurn", () => {
     expect(messages[2].role).toBe("assistant");
   });
 });
+
+describe("trimHistory", () => {
+  const history = (): ChatMessage[] => [
+    { role: "system", content: "sys" },
+    { role: "user", content: "u1" },
+    { role: "assistant", content: "a1" },
+    { role: "user", content: "u2" },
+    {
+      role: "assistant",
+      content: null,
+      tool_calls: [{
+        id: "c1",
+        type: "function",
+        function: { name: "t", arguments: "{}" },
+      }],
+    },
+    { role: "tool", content: "r", tool_call_id: "c1" },
+    { role: "assistant", content: "a2" },
+    { role: "user", content: "u3" },
+    { role: "assistant", content: "a3" },
+  ];
+
+  it("keeps the system prompt and the last N turns", () => {
+    const messages = history();
+    trimHistory(messages, 2);
+    expect(messages.map((m) => m.content)).toEqual([
+      "sys",
+      "u2",
+      null,
+      "r",
+      "a2",
+      "u3",
+      "a3",
+    ]);
+  });
+
+  it("leaves short histories untouched", () => {
+    const messages = history();
+    trimHistory(messages, 3);
+    expect(messages).toEqual(history());
+  });
+
+  it("trims down to keepTurns so the prefix holds for later turns", () => {
+    const messages = history();
+    trimHistory(messages, 2, 1);
+    expect(messages.map((m) => m.content)).toEqual(["sys", "u3", "a3"]);
+
+    messages.push({ role: "user", content: "u4" });
+    messages.push({ role: "assistant", content: "a4" });
+    trimHistory(messages, 2, 1);
+    expect(messages.map((m) => m.content)).toEqual([
+      "sys",
+      "u3",
+      "a3",
+      "u4",
+      "a4",
+    ]);
+  });
+});
+
+describe("executeTurns", () => {
+  it("runs turns concurrently with isolated histories, in order", async () => {
+    let inFlight = 0;
+    let maxInFlight = 0;
+    const seen: ChatMessage[][] = [];
+    const { messages: _, ...ctx } = createCtx({
+      callLLM: async (opts) => {
+        seen.push([...opts.messages]);
+        inFlight++;
+        maxInFlight = Math.max(maxInFlight, inFlight);
+        await new Promise((r) => setTimeout(r, 5));
+        inFlight--;
+        const last = opts.messages[opts.messages.length - 1];
+        return createMockLLMResponse(`echo ${last.content}`);
+      },
+    });
+    const prefix: ChatMessage[] = [{ role: "system", content: "sys" }];
+
+    const results = await executeTurns(
+      ["a", "b", "c"],
+      prefix,
+      ctx,
+      new AbortController().signal,
+      2,
+    );
+
+    expect(results.map((r) => r.text)).toEqual(["echo a", "echo b", "echo c"]);
+    expect(maxInFlight).toBe(2);
+    expect(seen.every((m) => m.length === 2)).toBe(true);
+    expect(prefix).toHaveLength(1);
+  });
+});
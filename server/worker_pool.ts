@@ -8,6 +8,8 @@ import type { ExecuteTool } from "./tool_executor.ts";
 import type { AgentConfig, ToolSchema } from "./types.ts";
 import type { WorkerApi } from "./worker_entry.ts";
 import type { AgentMetadata } from "./kv_store.ts";
+import { ResponseCache } from "./response_cache.ts";
+import { AudioCache } from "./audio_cache.ts";
 
 const log = getLogger("worker-pool");
 
@@ -21,6 +23,8 @@ export interface AgentInfo {
   workerApi: Comlink.Remote<WorkerApi>;
   config: AgentConfig;
   toolSchemas: ToolSchema[];
+  responseCache: ResponseCache;
+  audioCache: AudioCache;
 }
 
 export interface AgentSlot {
@@ -120,6 +124,8 @@ export async function spawnAgent(
     workerApi,
     config: agentConfig,
     toolSchemas: allToolSchemas,
+    responseCache: new ResponseCache(),
+    audioCache: new AudioCache(),
   };
   log.info("Agent loaded", { slug, name: agentInfo.name });
   return agentInfo;
@@ -7,6 +7,8 @@ import {
   trackSessionClose,
   trackSessionOpen,
 } from "./worker_pool.ts";
+import { ResponseCache } from "./response_cache.ts";
+import { AudioCache } from "./audio_cache.ts";
 
 const VALID_ENV = {
   ASSEMBLYAI_API_KEY: "test-key",
@@ -38,6 +40,8 @@ function makeFakeAgent(slug = "test"): AgentInfo {
     workerApi: {} as AgentInfo["workerApi"],
     config: {} as AgentInfo["config"],
     toolSchemas: [],
+    responseCache: new ResponseCache(),
+    audioCache: new AudioCache(),
   };
 }
 
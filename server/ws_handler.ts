@@ -34,13 +34,7 @@ export function handleSessionWebSocket(
 
   let processingChain: Promise<void> = Promise.resolve();
 
-  function processControlMessage(raw: string): void {
-    let json;
-    try {
-      json = JSON.parse(raw);
-    } catch {
-      return;
-    }
+  function processControlMessage(json: unknown): void {
     const parsed = ControlMessageSchema.safeParse(json);
     if (!parsed.success) return;
 
@@ -53,16 +47,28 @@ export function handleSessionWebSocket(
     }
   }
 
+  function logControlError(err: unknown): void {
+    log.error("Control message processing error", {
+      ...ctx,
+      sid,
+      error: err,
+    });
+  }
+
+  // Only messages that arrive before the session is ready are chained;
+  // afterwards the chain has drained and messages are handled inline.
   function enqueueControl(raw: string): void {
     processingChain = processingChain
-      .then(() => processControlMessage(raw))
-      .catch((err) => {
-        log.error("Control message processing error", {
-          ...ctx,
-          sid,
-          error: err,
-        });
-      });
+      .then(() => {
+        let json;
+        try {
+          json = JSON.parse(raw);
+        } catch {
+          return;
+        }
+        processControlMessage(json);
+      })
+      .catch(logControlError);
   }
 
   ws.onopen = () => {
@@ -130,7 +136,11 @@ export function handleSessionWebSocket(
       return;
     }
 
-    enqueueControl(event.data as string);
+    try {
+      processControlMessage(data);
+    } catch (err) {
+      logControlError(err);
+    }
   };
 
   ws.onclose = async () => {
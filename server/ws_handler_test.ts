@@ -149,6 +149,15 @@ describe("handleSessionWebSocket", () => {
     expect(spy.calls).toContain("onReset");
   });
 
+  it("handles control messages synchronously once ready", async () => {
+    const { ws, spy } = setup();
+    ws.open();
+    await new Promise((r) => setTimeout(r, 10));
+
+    ws.msg(JSON.stringify({ type: "cancel" }));
+    expect(spy.calls).toContain("onCancel");
+  });
+
   it("dispatches binary audio to session.onAudio", async () => {
     const { ws, spy } = setup();
     ws.open();
@@ -98,6 +98,7 @@ export function createMockSignals(
     state: AgentState;
     messages: Message[];
     transcript: string;
+    step: string;
     error: string;
     started: boolean;
     running: boolean;
@@ -107,6 +108,7 @@ export function createMockSignals(
     state: signal<AgentState>(overrides?.state ?? "connecting"),
     messages: signal<Message[]>(overrides?.messages ?? []),
     transcript: signal<string>(overrides?.transcript ?? ""),
+    step: signal<string>(overrides?.step ?? ""),
     error: signal<string>(overrides?.error ?? ""),
     started: signal<boolean>(overrides?.started ?? false),
     running: signal<boolean>(overrides?.running ?? true),
@@ -52,6 +52,10 @@ const indicator = css`
     color: var(--aai-text-muted);
     text-transform: capitalize;
   }
+  & .step {
+    font-size: 12px;
+    color: var(--aai-text-muted);
+  }
 `;
 
 const errorBanner = css`
@@ -124,11 +128,14 @@ const bubble = css`
   }
 `;
 
-export function StateIndicator({ state }: { state: AgentState }) {
+export function StateIndicator(
+  { state, step }: { state: AgentState; step?: string },
+) {
   return (
     <div class={indicator}>
       <div class="dot" style={{ background: `var(--aai-state-${state})` }} />
       <span class="label">{state}</span>
+      {step && <span class="step">{step}</span>}
     </div>
   );
 }
@@ -164,7 +171,7 @@ export function Transcript({ text }: { text: string }) {
 }
 
 export function ChatView() {
-  const { state, messages, transcript, error, running, toggle, reset } =
+  const { state, messages, transcript, step, error, running, toggle, reset } =
     useSession();
   const scrollRef = useRef<HTMLDivElement>(null);
 
@@ -174,7 +181,7 @@ export function ChatView() {
 
   return (
     <div class={layout}>
-      <StateIndicator state={state.value} />
+      <StateIndicator state={state.value} step={step.value} />
       <ErrorBanner error={error.value} />
       <div class={messageArea}>
         {messages.value.map((msg, i) => (
@@ -45,6 +45,14 @@ describe(
         render(<StateIndicator state="listening" />, container);
         expect(container.textContent).toContain("listening");
       });
+
+      it("renders the current step", () => {
+        render(
+          <StateIndicator state="thinking" step="Using web_search" />,
+          container,
+        );
+        expect(container.textContent).toContain("Using web_search");
+      });
     });
 
     describe("ErrorBanner", () => {
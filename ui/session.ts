@@ -70,6 +70,7 @@ export function createReconnect(
 export interface SessionEventMap {
   stateChange: AgentState;
   message: Message;
+  step: string;
   transcript: string;
   error: SessionError;
   connected: void;
@@ -213,6 +214,12 @@ export class VoiceSession extends TypedEmitter<SessionEventMap> {
       case "thinking":
         this.changeState("thinking");
         break;
+      case "step":
+        this.emit("step", msg.step);
+        break;
+      case "speaking":
+        this.changeState("speaking");
+        break;
       case "chat":
         this.emit("message", {
           role: "assistant",
@@ -12,6 +12,8 @@ describe("parseServerMessage", () => {
     ["transcript", { type: "transcript", text: "hello", final: false }],
     ["turn", { type: "turn", text: "What's the weather?" }],
     ["thinking", { type: "thinking" }],
+    ["step", { type: "step", step: "Using web_search" }],
+    ["speaking", { type: "speaking" }],
     ["chat", { type: "chat", text: "It's sunny!", steps: [] }],
     ["tts_done", { type: "tts_done" }],
     ["cancelled", { type: "cancelled" }],
@@ -177,6 +179,29 @@ describe("VoiceSession", () => {
       session.disconnect();
     });
 
+    it("handles STEP message", async () => {
+      const steps: string[] = [];
+      const { session, ws } = await connectSession();
+      session.on("step", (s) => steps.push(s));
+
+      ws.simulateMessage(
+        JSON.stringify({ type: "step", step: "Using web_search" }),
+      );
+      expect(steps).toEqual(["Using web_search"]);
+      session.disconnect();
+    });
+
+    it("handles SPEAKING message", async () => {
+      const states: string[] = [];
+      const { session, ws } = await connectSession();
+      session.on("stateChange", (s) => states.push(s));
+
+      ws.simulateMessage(JSON.stringify({ type: "thinking" }));
+      ws.simulateMessage(JSON.stringify({ type: "speaking" }));
+      expect(states).toEqual(["thinking", "speaking"]);
+      session.disconnect();
+    });
+
     it("handles CHAT message", async () => {
       const messages: unknown[] = [];
       const states: string[] = [];
@@ -9,20 +9,24 @@ export function createSessionSignals(session: VoiceSession) {
   const state = signal<AgentState>("connecting");
   const messages = signal<Message[]>([]);
   const transcript = signal<string>("");
+  const step = signal<string>("");
   const error = signal<string>("");
   const started = signal(false);
   const running = signal(true);
 
   session.on("stateChange", (s) => {
     state.value = s;
+    if (s !== "thinking") step.value = "";
     if (s === "error") running.value = false;
   });
   session.on("message", (msg) => (messages.value = [...messages.value, msg]));
+  session.on("step", (s) => (step.value = s));
   session.on("transcript", (t) => (transcript.value = t));
   session.on("error", (err) => (error.value = err.message));
   session.on("reset", () => {
     messages.value = [];
     transcript.value = "";
+    step.value = "";
     error.value = "";
   });
 
@@ -30,6 +34,7 @@ export function createSessionSignals(session: VoiceSession) {
     state,
     messages,
     transcript,
+    step,
     error,
     started,
     running,
@@ -83,6 +83,19 @@ describe("createSessionSignals", () => {
     session.disconnect();
   });
 
+  it("shows the current step while thinking", async () => {
+    const { signals, connect, send, session } = setup(mock);
+    await connect();
+
+    send({ type: "thinking" });
+    send({ type: "step", step: "Using web_search" });
+    expect(signals.step.value).toBe("Using web_search");
+
+    send({ type: "chat", text: "Sunny.", steps: ["Using web_search"] });
+    expect(signals.step.value).toBe("");
+    session.disconnect();
+  });
+
   it("updates error", async () => {
     const { signals, connect, send, session } = setup(mock);
     await connect();